@@ -22,6 +22,8 @@ real world problems
 '''
 
 class LinkedListNode:
+    __slots__ = ('second', 'first', 'pair', 'next', 'previous')
+
     def __init__(self, pair):
         self.second = pair[1]
         self.first = pair[0]
@@ -38,19 +40,22 @@ class LinkedList:
 
     # moves given node to head 
     def move_to_head(self, node):
-        if not node:
-            return 
-        
+        if not node or node == self.head:
+            return
+
         if node.previous:
-            node.previous.next = node.next 
-            
+            node.previous.next = node.next
+
         if node.next:
             node.next.previous = node.previous
-            
-        if node == self.head:
-            self.head = self.head.next 
-        
-        # insertion at head 
+
+        # node leaving tail position hands it to its predecessor
+        if node == self.tail:
+            self.tail = node.previous
+
+        node.previous = None
+
+        # insertion at head
         if not self.head:
             self.tail = node 
             self.head = node
@@ -130,6 +135,263 @@ class LinkedList:
     # return tail of linked list 
     def get_tail(self):
         return self.tail 
+
+    # return key stored in given node
+    def get_key(self, node):
+        return node.pair[0]
+
+    # return value stored in given node
+    def get_value(self, node):
+        return node.pair[1]
+
+    # overwrite value stored in given node
+    def set_value(self, node, value):
+        node.pair[1] = value
+
+'''
+compact linked list backend: instead of one node object per entry, links live in preallocated 
+integer arrays (next/previous hold slot indexes, -1 = no node) and keys/values sit in parallel
+arrays, unused slots chained through next array form a free list so insert/evict reuse slots
+instead of allocating and freeing objects
+
+several ArrayLinkedList objects can share one NodePool, LFU cache keeps one list per frequency
+on a single pool so moving key between frequencies only relinks indexes
+
+time O(1) per operation, space O(capacity) allocated up front
+'''
+from array import array
+
+class NodePool:
+    __slots__ = ('capacity', 'keys', 'values', 'next', 'previous', 'free')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # parallel arrays indexed by slot
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+        # every slot starts on free list, slot i points to slot i + 1 and last slot ends chain
+        self.next = array('l', range(1, capacity + 1))
+        if capacity:
+            self.next[capacity - 1] = -1
+        self.previous = array('l', [-1]) * capacity
+        self.free = 0 if capacity else -1
+
+    # take slot from free list and store key/value in it, returns slot index
+    def allocate(self, key, value):
+        index = self.free
+        if index == -1:
+            raise IndexError("node pool exhausted")
+
+        self.free = self.next[index]
+        self.keys[index] = key
+        self.values[index] = value
+        self.next[index] = self.previous[index] = -1
+        return index
+
+    # return slot to free list, drop references so key/value can be collected
+    def release(self, index):
+        self.keys[index] = self.values[index] = None
+        self.previous[index] = -1
+        self.next[index] = self.free
+        self.free = index
+
+class ArrayLinkedList:
+    __slots__ = ('pool', 'head', 'tail', 'size')
+
+    # initializes empty list over given pool, list owns no memory of its own
+    def __init__(self, pool):
+        self.pool = pool
+        self.head = -1
+        self.tail = -1
+        self.size = 0
+
+    # unlink slot from list without releasing it
+    def detach_node(self, index):
+        next_links, previous_links = self.pool.next, self.pool.previous
+
+        if previous_links[index] != -1:
+            next_links[previous_links[index]] = next_links[index]
+        else:
+            self.head = next_links[index]
+
+        if next_links[index] != -1:
+            previous_links[next_links[index]] = previous_links[index]
+        else:
+            self.tail = previous_links[index]
+
+        next_links[index] = previous_links[index] = -1
+        self.size -= 1
+
+    # link already allocated slot in front of head
+    def attach_at_head(self, index):
+        self.pool.next[index] = self.head
+        if self.head != -1:
+            self.pool.previous[self.head] = index
+        else:
+            self.tail = index
+        self.head = index
+        self.size += 1
+
+    # link already allocated slot after tail
+    def attach_at_tail(self, index):
+        self.pool.previous[index] = self.tail
+        if self.tail != -1:
+            self.pool.next[self.tail] = index
+        else:
+            self.head = index
+        self.tail = index
+        self.size += 1
+
+    # moves given slot to head
+    def move_to_head(self, index):
+        if index == -1 or index == self.head:
+            return
+        self.detach_node(index)
+        self.attach_at_head(index)
+
+    # insert given pair at head, returns its slot
+    def insert_at_head(self, pair):
+        index = self.pool.allocate(pair[0], pair[1])
+        self.attach_at_head(index)
+        return index
+
+    # insert given pair at tail, returns its slot
+    def insert_at_tail(self, pair):
+        index = self.pool.allocate(pair[0], pair[1])
+        self.attach_at_tail(index)
+        return index
+
+    # removes given slot from list and hands it back to pool
+    def remove_node(self, index):
+        if index == -1:
+            return
+        self.detach_node(index)
+        self.pool.release(index)
+
+    # remove head of list
+    def remove_head(self):
+        return self.remove_node(self.head)
+
+    # remove tail of list
+    def remove_tail(self):
+        return self.remove_node(self.tail)
+
+    # removes head slot, returns its key
+    def remove_head_node(self):
+        if self.head == -1:
+            return None
+        key = self.pool.keys[self.head]
+        self.remove_node(self.head)
+        return key
+
+    # return head slot of list
+    def get_head(self):
+        return self.head
+
+    # return tail slot of list
+    def get_tail(self):
+        return self.tail
+
+    # return key stored in given slot
+    def get_key(self, index):
+        return self.pool.keys[index]
+
+    # return value stored in given slot
+    def get_value(self, index):
+        return self.pool.values[index]
+
+    # overwrite value stored in given slot
+    def set_value(self, index, value):
+        self.pool.values[index] = value
+
+'''
+expiry and byte budget bookkeeping shared by LRU and LFU caches
+
+- ttl: entry expires ttl seconds after it was last set, expired entries are dropped lazily when 
+  read and by sweep(), which pops at most sweep_limit due entries from a min heap of expiry times 
+  so each call does bounded work no matter how many entries went stale at once
+- max_bytes: cache evicts by its own policy until sum of sizeof(value) fits in budget, entry larger 
+  than whole budget is rejected (measure / fits) before cache changes, so it neither evicts nor 
+  overwrites anything
+
+heap entries are not removed when key is updated or evicted, sweep skips any entry whose expiry 
+no longer matches key's current one and heap is rebuilt once stale entries outnumber live ones
+
+time O(logn) per set w ttl, O(1) otherwise, space O(n)
+'''
+import heapq
+import sys
+import time
+from itertools import count
+
+class EntryLimits:
+    def __init__(self, ttl=None, max_bytes=None, sizeof=None, clock=None, sweep_limit=16):
+        self.default_ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or sys.getsizeof
+        self.clock = clock or time.monotonic
+        self.sweep_limit = sweep_limit
+
+        self.expires_at = {} # map key to time it expires, only keys w ttl 
+        self.expiry_heap = [] # min heap of (expires at, tie breaker, key), may hold stale entries 
+        self.sequence = count() # tie breaker so keys of different types are never compared 
+        self.entry_bytes = {} # map key to size of its value, only tracked w max_bytes 
+        self.total_bytes = 0
+
+    # size of value for byte budget, None w/ out budget, taken before cache changes so rejected value leaves it intact 
+    def measure(self, value):
+        return None if self.max_bytes is None else self.sizeof(value)
+
+    # check if value of given size can ever fit in byte budget 
+    def fits(self, size):
+        return size is None or size <= self.max_bytes
+
+    # store expiry and size (from measure) for key once cache holds it 
+    def record(self, key, size, ttl=None):
+        if size is not None:
+            self.total_bytes += size - self.entry_bytes.get(key, 0)
+            self.entry_bytes[key] = size
+
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl is not None:
+            expires_at = self.clock() + ttl
+            self.expires_at[key] = expires_at
+            heapq.heappush(self.expiry_heap, (expires_at, next(self.sequence), key))
+
+            # drop stale heap entries once they dominate
+            if len(self.expiry_heap) > 2 * len(self.expires_at) + self.sweep_limit:
+                self.expiry_heap = [(t, next(self.sequence), k) for k, t in self.expires_at.items()]
+                heapq.heapify(self.expiry_heap)
+        elif key in self.expires_at:
+            del self.expires_at[key]
+
+    # drop all bookkeeping for key once it leaves cache
+    def forget(self, key):
+        self.expires_at.pop(key, None)
+        self.total_bytes -= self.entry_bytes.pop(key, 0)
+
+    # check if key has expired
+    def is_expired(self, key):
+        return key in self.expires_at and self.expires_at[key] <= self.clock()
+
+    # check if cached values exceed byte budget
+    def over_budget(self):
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    # pop up to limit keys whose expiry has passed, caller removes them from cache
+    def due_keys(self, limit=None):
+        limit = self.sweep_limit if limit is None else limit
+        now = self.clock()
+        keys = []
+
+        while self.expiry_heap and len(keys) < limit and self.expiry_heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(self.expiry_heap)
+            # skip heap entries left behind by later sets, evictions and deletes
+            if self.expires_at.get(key) == expires_at:
+                keys.append(key)
+
+        return keys
+
 '''
 statement: implement a Snapshot Array with the following properties:
 
@@ -153,6 +415,7 @@ time: constructor(), get value(idx, snap id), set value(idx, val) -> O(1), snaps
 space O(n x m), n = number of nodes, m = number of snapshots taken
 '''
 import copy 
+from collections import defaultdict
 
 class SnapshotArray:
     # constructor
@@ -188,6 +451,20 @@ class SnapshotArray:
     def __str__(self):
         return str(self.node_value)
 
+    # write history of every index to path, read back w MappedSnapshotArray 
+    def save(self, path):
+        snap_ids, values = defaultdict(list), defaultdict(list)
+
+        # snapshots only ever add or change indexes, record index only when its value changes 
+        for snap_id in range(self.snap_id + 1):
+            for idx, val in self.node_value[snap_id].items():
+                if not values[idx] or values[idx][-1] != val:
+                    snap_ids[idx].append(snap_id)
+                    values[idx].append(val)
+
+        histories = ((idx, snap_ids[idx], values[idx]) for idx in snap_ids)
+        write_history_file(path, histories, (self.ncount, self.snap_id, 0))
+
 # space O(n * m), n = number of snapshots, m = length of array
 # time: set_value() O(1), snapshot() O(m), get_value() O(1)
 class NaiveSnapshot:
@@ -208,7 +485,82 @@ class NaiveSnapshot:
         if snap_id < len(self.snapshots):
             return self.snapshots[snap_id][idx]
         return 0
-    
+
+'''
+versioned snapshot array: instead of copying whole array on every snapshot, each index keeps its own 
+history as sorted (snap id, value) columns, set_value appends new version only when index first 
+changes after a snapshot and overwrites it otherwise, so snapshot just increments counter
+
+get_value binary searches index's snap id column for last version taken at or before requested 
+snapshot, compact(before_snap_id) drops versions no snapshot from before_snap_id onwards can see, 
+after it snapshots older than before_snap_id are no longer readable
+
+time: set_value() O(1), snapshot() O(1), get_value() O(log v), compact() O(n) 
+space O(n + c), n = length, c = number of changes kept
+'''
+from bisect import bisect_right
+
+class VersionedSnapshotArray:
+    def __init__(self, length):
+        self.snap_id = 0 # id next snapshot will get, sets always go to this version 
+        self.oldest_snap_id = 0 # snapshots before this one dropped by compact 
+        self.ncount = length
+        self.snap_ids = {} # map index to array of snap ids it changed in, increasing 
+        self.values = {} # map index to list of values parallel to snap ids 
+
+    # sets value at index idx to val in current version 
+    def set_value(self, idx, val):
+        if idx >= self.ncount:
+            return
+
+        if idx not in self.snap_ids:
+            self.snap_ids[idx] = array('l', [self.snap_id])
+            self.values[idx] = [val]
+        elif self.snap_ids[idx][-1] == self.snap_id:
+            # index already changed since last snapshot, overwrite that version 
+            self.values[idx][-1] = val
+        else:
+            self.snap_ids[idx].append(self.snap_id)
+            self.values[idx].append(val)
+
+    # freezes current version, returns its snap id 
+    def snapshot(self):
+        self.snap_id += 1
+        return self.snap_id - 1
+
+    # returns value at index idx as of given snapshot 
+    def get_value(self, idx, snap_id):
+        # validates existence of snapshot 
+        if not (self.oldest_snap_id <= snap_id < self.snap_id and idx < self.ncount):
+            return None
+
+        if idx not in self.snap_ids:
+            return 0
+
+        # last version set at or before requested snapshot 
+        position = bisect_right(self.snap_ids[idx], snap_id) - 1
+        return self.values[idx][position] if position >= 0 else 0
+
+    # drop versions only visible to snapshots older than before_snap_id 
+    def compact(self, before_snap_id):
+        before_snap_id = min(before_snap_id, self.snap_id)
+        if before_snap_id <= self.oldest_snap_id:
+            return
+
+        for idx, snap_ids in self.snap_ids.items():
+            # keep newest version at or before cutoff since it is still value seen at cutoff 
+            position = bisect_right(snap_ids, before_snap_id) - 1
+            if position > 0:
+                del snap_ids[:position]
+                del self.values[idx][:position]
+
+        self.oldest_snap_id = before_snap_id
+
+    # write history of every index to path, read back w MappedSnapshotArray 
+    def save(self, path):
+        histories = ((idx, self.snap_ids[idx], self.values[idx]) for idx in self.snap_ids)
+        write_history_file(path, histories, (self.ncount, self.snap_id, self.oldest_snap_id))
+
 '''
 statement: implement a data structure that can store multiple values of the same key at different 
 timestamps and retrieve the key's value at a certain timestamp, implement TimeStamp class w/ following functions:
@@ -222,8 +574,15 @@ return the value corresponding to the most recent timestamp before the query's t
 if there are no timestamps before the query's timestamp, return an empty string
 
 time set_value() O(1), binary_search() O(logn), space O(n)
+
+time series extensions: 
+    set_many(key, timestamps, values): batch append, batch may be unsorted or older than stored data, 
+        O(m) when batch sorted and newer than stored data, O((n + m) log(n + m)) merge otherwise
+    get_range(key, t_start, t_end): (timestamp, value) pairs recorded in [t_start, t_end], O(logn + r)
+    get_many(keys, timestamp): get_value for every key at one point in time, O(k logn)
 '''
 import random
+from bisect import bisect_left, bisect_right
         
 class TimeStamp:
     def __init__(self):
@@ -232,15 +591,20 @@ class TimeStamp:
 
     #  set TimeStamp data variables, adds key w value for given timestamp
     def set_value(self, key, value, timestamp):
+        # timestamp older than latest one stored, binary search its place, after stored entries w same timestamp 
+        if key in self.timestamps_dict and timestamp < self.timestamps_dict[key][-1]:
+            index = bisect_right(self.timestamps_dict[key], timestamp)
+            self.timestamps_dict[key].insert(index, timestamp)
+            self.values_dict[key].insert(index, value)
         # check if given key already exists in values dictionary
-        if key in self.values_dict:
-            # check if given value of key already exists in values dictionary 
-            if value != self.values_dict[key][len(self.values_dict[key]) - 1]:
-                # store values for given key in values dictionary 
-                self.values_dict[key].append(value)
-
-                # store timestamp for given key in timestamp dictionary
-                self.timestamps_dict[key].append(timestamp)
+        # repeated values are kept too, later insert at older timestamp could otherwise land between 
+        # value and dropped repeat of it and change what repeat's timestamp reads back 
+        elif key in self.values_dict:
+            # store values for given key in values dictionary 
+            self.values_dict[key].append(value)
+
+            # store timestamp for given key in timestamp dictionary
+            self.timestamps_dict[key].append(timestamp)
         else:
             # store value and key for given key in values dictionary 
             self.values_dict[key] = [value]
@@ -250,21 +614,8 @@ class TimeStamp:
     
     # find index of right most occurrence of given timestamp using binary search 
     def search_index(self, n, key, timestamp):
-        left = 0
-        right = n 
-        mid = 0 
-        
-        while left < right:
-            # returns middle of current dictionary
-            mid = (left + right) >> 1
-            
-            # increase index value if required index less than current index, otherwise decrease it 
-            if self.timestamps_dict[key][mid] <= timestamp:
-                left = mid + 1
-            else:
-                right = mid
-                
-        return left - 1
+        # bisect runs search in C over key's list instead of re-indexing dictionary every probe 
+        return bisect_right(self.timestamps_dict[key], timestamp, 0, n) - 1
 
     # Get TimeStamp data variables
     def get_value(self, key, timestamp):
@@ -283,6 +634,56 @@ class TimeStamp:
             # return empty string if required timestamp less than timestamps that were previously set 
             return ""
 
+    # adds batch of values for key, later entry wins when timestamps tie 
+    def set_many(self, key, timestamps, values):
+        batch = list(zip(timestamps, values))
+        if not batch:
+            return
+
+        # stable sort keeps batch order among equal timestamps 
+        if any(batch[i][0] > batch[i + 1][0] for i in range(len(batch) - 1)):
+            batch.sort(key=lambda entry: entry[0])
+
+        if key in self.timestamps_dict and batch[0][0] < self.timestamps_dict[key][-1]:
+            # batch reaches back before stored data, stored prefix older than batch stays put, only tail 
+            # from first batch timestamp on merged w batch (both sorted runs), stored entries first on ties 
+            timestamps, values = self.timestamps_dict[key], self.values_dict[key]
+            cut = bisect_right(timestamps, batch[0][0])
+            merged = list(heapq.merge(zip(timestamps[cut:], values[cut:]), batch, key=lambda entry: entry[0]))
+            del timestamps[cut:]
+            del values[cut:]
+            timestamps.extend(timestamp for timestamp, _ in merged)
+            values.extend(value for _, value in merged)
+        else:
+            self.timestamps_dict.setdefault(key, []).extend(timestamp for timestamp, _ in batch)
+            self.values_dict.setdefault(key, []).extend(value for _, value in batch)
+
+    # (timestamp, value) pairs recorded for key between t_start and t_end inclusive 
+    def get_range(self, key, t_start, t_end):
+        if key not in self.timestamps_dict:
+            return []
+
+        timestamps = self.timestamps_dict[key]
+        start = bisect_left(timestamps, t_start)
+        end = bisect_right(timestamps, t_end)
+        return list(zip(timestamps[start:end], self.values_dict[key][start:end]))
+
+    # value of every key at given timestamp, "" for keys w nothing recorded by then 
+    def get_many(self, keys, timestamp):
+        result = []
+        for key in keys:
+            if key not in self.timestamps_dict:
+                result.append("")
+                continue
+            index = bisect_right(self.timestamps_dict[key], timestamp) - 1
+            result.append(self.values_dict[key][index] if index > -1 else "")
+        return result
+
+    # write every key's timestamp and value columns to path, read back w MappedTimeStamp 
+    def save(self, path):
+        histories = ((key, self.timestamps_dict[key], self.values_dict[key]) for key in self.values_dict)
+        write_history_file(path, histories)
+
 class NaiveTimeStamp:
     def __init__(self):
         self.keys = []
@@ -302,7 +703,186 @@ class NaiveTimeStamp:
             if self.keys[i] == key and self.timestamps[i] <= timestamp:
                 return self.values[i]
         return "" # return empty string if no match found 
-    
+
+'''
+persist TimeStamp and snapshot array histories so restart does not lose them, file holds one sorted 
+history per key in columns:
+
+    header     magic, byte order check, key count, row count, blob lengths, 3 caller ints (meta)
+    directory  per key, sorted by encoded key: key offset, key length, first row, row count
+    timestamps one int64 per row, rows of each key contiguous and increasing
+    offsets    row count + 1 int64 offsets of each pickled value inside value blob
+    key blob   encoded keys, value blob   pickled values
+
+all int columns are 8 byte aligned native int64, loading maps file w mmap and casts columns to 
+memoryviews, get_value binary searches directory then key's timestamp rows directly in mapped 
+memory and unpickles only value it returns, keys never queried never become Python objects
+
+keys are matched by bytes of fixed encoding (encode_history_key), not pickle, so file stays readable 
+when interpreter's default pickle protocol changes, keys limited to None, int, str, bytes and tuples of them
+
+time: save O(r log k), load O(1), get_value O(log k + log r), space O(1) beyond mapped file
+'''
+import mmap
+import pickle
+
+HISTORY_MAGIC = b'HISTCOL2'
+HISTORY_BYTE_ORDER = 0x0102030405060708
+HISTORY_HEADER = 8 + 8 * 8 # magic + 8 int64 fields 
+
+# type tag + payload, tuple items length prefixed so ("ab", "c") and ("a", "bc") differ 
+def encode_history_key(key):
+    if key is None:
+        return b'n'
+    if isinstance(key, int):
+        return b'i' + str(int(key)).encode('ascii')
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, bytes):
+        return b'b' + key
+    if isinstance(key, tuple):
+        encoded = bytearray(b't')
+        for item in key:
+            item = encode_history_key(item)
+            encoded += len(item).to_bytes(8, 'little') + item
+        return bytes(encoded)
+    raise TypeError("history keys must be None, int, str, bytes or tuples of them, not " + type(key).__name__)
+
+# write (key, timestamps, values) histories to path, timestamps of each key must be increasing ints 
+def write_history_file(path, histories, meta=(0, 0, 0)):
+    entries = sorted(((encode_history_key(key), timestamps, values) for key, timestamps, values in histories), 
+                     key=lambda entry: entry[0])
+
+    directory, timestamps_column, offsets_column = array('q'), array('q'), array('q', [0])
+    key_blob, value_blob = bytearray(), bytearray()
+
+    for encoded_key, timestamps, values in entries:
+        directory.extend((len(key_blob), len(encoded_key), len(timestamps_column), len(timestamps)))
+        key_blob += encoded_key
+        timestamps_column.fromlist(list(timestamps))
+        for value in values:
+            value_blob += pickle.dumps(value)
+            offsets_column.append(len(value_blob))
+
+    # pad key blob so value blob offsets stay simple and columns stay aligned 
+    key_blob += bytes(-len(key_blob) % 8)
+
+    header = array('q', [HISTORY_BYTE_ORDER, len(entries), len(timestamps_column), len(key_blob),
+                         len(value_blob), *meta])
+    with open(path, 'wb') as file:
+        file.write(HISTORY_MAGIC)
+        file.write(header.tobytes())
+        file.write(directory.tobytes())
+        file.write(timestamps_column.tobytes())
+        file.write(offsets_column.tobytes())
+        file.write(key_blob)
+        file.write(value_blob)
+
+class MappedHistory:
+    # value returned when key missing or no timestamp at or before query 
+    default = ""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.map)
+
+        magic = bytes(self.buffer[:8])
+        if magic != HISTORY_MAGIC:
+            self.close()
+            if magic[:7] == HISTORY_MAGIC[:7]:
+                raise ValueError("unsupported history file version " + magic.decode('ascii', 'replace') + ": " + str(path))
+            raise ValueError("not a history file: " + str(path))
+
+        header = self.buffer[8:HISTORY_HEADER].cast('q')
+        if header[0] != HISTORY_BYTE_ORDER:
+            header.release()
+            self.close()
+            raise ValueError("history file written w different byte order")
+        self.key_count, self.row_count, key_blob_length, value_blob_length = header[1:5]
+        self.meta = tuple(header[5:8])
+        header.release()
+
+        # slice every column out of mapped file without copying 
+        start = HISTORY_HEADER
+        self.directory = self.buffer[start:start + 32 * self.key_count].cast('q')
+        start += 32 * self.key_count
+        self.timestamps = self.buffer[start:start + 8 * self.row_count].cast('q')
+        start += 8 * self.row_count
+        self.offsets = self.buffer[start:start + 8 * (self.row_count + 1)].cast('q')
+        start += 8 * (self.row_count + 1)
+        self.key_blob = self.buffer[start:start + key_blob_length]
+        start += key_blob_length
+        self.value_blob = self.buffer[start:start + value_blob_length]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # release every view before closing map, mmap refuses to close while views exported 
+    def close(self):
+        for name in ('directory', 'timestamps', 'offsets', 'key_blob', 'value_blob', 'buffer'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.map.close()
+        self.file.close()
+
+    # binary search directory for key, returns (first row, row count) or None 
+    def find_key(self, key):
+        try:
+            encoded_key = encode_history_key(key)
+        except TypeError:
+            return None
+        left, right = 0, self.key_count
+
+        while left < right:
+            mid = (left + right) >> 1
+            offset, length = self.directory[4 * mid], self.directory[4 * mid + 1]
+            candidate = self.key_blob[offset:offset + length]
+
+            if candidate == encoded_key:
+                return self.directory[4 * mid + 2], self.directory[4 * mid + 3]
+            if bytes(candidate) < encoded_key:
+                left = mid + 1
+            else:
+                right = mid
+        return None
+
+    # unpickle value stored in given row 
+    def row_value(self, row):
+        return pickle.loads(self.value_blob[self.offsets[row]:self.offsets[row + 1]])
+
+    # value of key at latest timestamp at or before given one 
+    def get_value(self, key, timestamp):
+        rows = self.find_key(key)
+        if rows is None:
+            return self.default
+
+        first, count = rows
+        row = bisect_right(self.timestamps, timestamp, first, first + count) - 1
+        return self.row_value(row) if row >= first else self.default
+
+# read only TimeStamp backed by file written by TimeStamp.save 
+class MappedTimeStamp(MappedHistory):
+    default = ""
+
+# read only snapshot array backed by file written by SnapshotArray.save or VersionedSnapshotArray.save 
+class MappedSnapshotArray(MappedHistory):
+    default = 0
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.ncount, self.snap_id, self.oldest_snap_id = self.meta
+
+    # returns value at index idx as of given snapshot, None for snapshots not taken or compacted 
+    def get_value(self, idx, snap_id):
+        if not (self.oldest_snap_id <= snap_id < self.snap_id and idx < self.ncount):
+            return None
+        return super().get_value(idx, snap_id)
+
 '''
 statement: implement an LRU cache class with the following functions:
 
@@ -319,16 +899,29 @@ are several caching algorithms to implement a cache eviction policy, LRU is a ve
 and commonly used algorithm, core concept of the LRU algorithm is to evict the oldest data
 from the cache to accommodate more data
 
+backend='array' keeps entries in a preallocated NodePool instead of one LinkedListNode per entry,
+cache_map then maps key to slot index rather than node
+
+ttl, max_bytes and sizeof are optional limits handled by EntryLimits, expired entries read as 
+missing and every set first sweeps a bounded batch of them, w max_bytes set LRU entries evicted 
+until sizeof of all values fits in budget
+
 time O(1). space O(n) where n = size of cache 
 '''
 
 class LRUCache:    
     
-    def __init__(self, capacity):
+    def __init__(self, capacity, backend='linked', ttl=None, max_bytes=None, sizeof=None, clock=None):
         # initializes LRU cache with capacity size 
         self.cache_capacity = capacity
         self.cache_map = {}
-        self.cache_list = LinkedList()
+        if backend == 'array':
+            self.cache_list = ArrayLinkedList(NodePool(capacity))
+        elif backend == 'linked':
+            self.cache_list = LinkedList()
+        else:
+            raise ValueError("unknown backend: " + str(backend))
+        self.limits = EntryLimits(ttl, max_bytes, sizeof, clock)
 
     # returns value of key or -1 if key does not exist 
     def get(self, key):
@@ -338,6 +931,11 @@ class LRUCache:
         # to get value if given key doesn't exist, return -1
         else:
             return -1
+
+        # expired entry removed on read and treated as missing 
+        if self.limits.is_expired(key):
+            self.delete(key)
+            return -1
         
         list_iterator = found_itr
         
@@ -345,10 +943,17 @@ class LRUCache:
         self.cache_list.move_to_head(found_itr)
         
         # return corresponding value to key
-        return list_iterator.pair[1]
+        return self.cache_list.get_value(list_iterator)
 
-    # setting a pair
-    def set(self, key, value):
+    # setting a pair, ttl overrides cache default for this entry
+    def set(self, key, value, ttl=None):
+        # value bigger than whole byte budget is rejected before cache changes 
+        size = self.limits.measure(value)
+        if not self.limits.fits(size):
+            return
+
+        # drop bounded batch of expired entries so they do not take room from live ones 
+        self.sweep()
         
         # check if given key already exists in cache hashmap
         if key in self.cache_map: 
@@ -360,26 +965,191 @@ class LRUCache:
             self.cache_list.move_to_head(found_iter)
             
             # update value of node
-            list_iterator.pair[1] = value
-            return 
-    
-        # if key does not exist and full cache
-        if len(self.cache_map) == self.cache_capacity:
-            # evict LRU entry by first getting key of LRU node (first element of each cache entry = key)
-            key_temp = self.cache_list.get_tail().pair[0]
+            self.cache_list.set_value(list_iterator, value)
+        else:
+            # if key does not exist and full cache, evict LRU entry 
+            if len(self.cache_map) == self.cache_capacity:
+                self.evict()
             
-            # remove last node in list 
-            self.cache_list.remove_tail()
+            # inserts new element at front of list in constant time 
+            self.cache_list.insert_at_head([key, value])
             
-            # remove entry from cache 
-            del self.cache_map[key_temp]
+            # set value of key as list beginning since we added new element at head of list
+            self.cache_map[key] = self.cache_list.get_head()
+
+        # track expiry and size 
+        self.limits.record(key, size, ttl)
+
+        # evict LRU entries until values fit in byte budget, new entry at head so never evicted here 
+        while self.limits.over_budget():
+            self.evict()
+
+    # evict least recently used entry, returns its key 
+    def evict(self):
+        # get key of LRU node (first element of each cache entry = key)
+        key_temp = self.cache_list.get_key(self.cache_list.get_tail())
         
-        # inserts new element at front of list in constant time 
-        self.cache_list.insert_at_head([key, value])
+        # remove last node in list 
+        self.cache_list.remove_tail()
         
-        # set value of key as list beginning since we added new element at head of list
-        self.cache_map[key] = self.cache_list.get_head()
-    
+        # remove entry from cache 
+        del self.cache_map[key_temp]
+        self.limits.forget(key_temp)
+        return key_temp
+
+    # remove key from cache, returns True if it was present 
+    def delete(self, key):
+        if key not in self.cache_map:
+            return False
+        self.cache_list.remove_node(self.cache_map.pop(key))
+        self.limits.forget(key)
+        return True
+
+    # remove up to limit expired entries, returns number removed 
+    def sweep(self, limit=None):
+        if not self.limits.expiry_heap:
+            return 0
+
+        removed = 0
+        for key in self.limits.due_keys(limit):
+            removed += self.delete(key)
+        return removed
+
+'''
+statement: extend LRU cache so it can sit in front of a hot lookup path shared by a thread pool,
+implement ShardedLRUCache w/ following functions:
+
+    init(capacity, shards): splits capacity across N independent LRUCache segments, each w its own lock
+    get(key) / set(key, value): same contract as LRUCache, key routed to segment by hash(key) % shards
+    get_many(keys): returns list of values (-1 for misses) in same order as keys
+    set_many(pairs): adds or updates every (key, value) pair
+    stats(): returns hits, misses, evictions, hit rate and per-shard occupancy
+
+wrapping single LRUCache in one global lock would serialize every get/set, here each segment has 
+own lock and sharding by key hash means threads touching different segments never contend, batch calls group keys by segment so each lock taken once per batch
+instead of once per key, counters kept per segment and only updated while holding that segment's lock
+
+time O(1) per key, O(k) per batch of k keys, space O(n) where n = size of cache
+'''
+import threading
+from collections import defaultdict
+
+class ShardedLRUCache:
+
+    def __init__(self, capacity, shards=16, backend='linked'):
+        # never create more segments than capacity allows, each segment holds at least 1 entry
+        self.shard_count = max(1, min(shards, capacity))
+        self.cache_capacity = capacity
+
+        # split capacity as evenly as possible, first (capacity % shards) segments take 1 extra slot
+        base, extra = divmod(capacity, self.shard_count)
+        self.shards = [LRUCache(base + (1 if i < extra else 0), backend) for i in range(self.shard_count)]
+        self.locks = [threading.Lock() for _ in range(self.shard_count)]
+
+        # per segment counters, only touched while holding segment lock
+        self.hits = [0] * self.shard_count
+        self.misses = [0] * self.shard_count
+        self.evictions = [0] * self.shard_count
+
+    # pick segment for key by hash
+    def shard_index(self, key):
+        return hash(key) % self.shard_count
+
+    # set key in given segment, caller must hold segment lock
+    def set_in_shard(self, index, key, value):
+        shard = self.shards[index]
+
+        # segment evicts its tail only when key is new and segment is full
+        if key not in shard.cache_map and len(shard.cache_map) == shard.cache_capacity:
+            self.evictions[index] += 1
+        shard.set(key, value)
+
+    # get key from given segment, caller must hold segment lock
+    def get_from_shard(self, index, key):
+        # check membership first since -1 may also be a stored value
+        if key in self.shards[index].cache_map:
+            self.hits[index] += 1
+        else:
+            self.misses[index] += 1
+        return self.shards[index].get(key)
+
+    # returns value of key or -1 if key does not exist
+    def get(self, key):
+        index = self.shard_index(key)
+        with self.locks[index]:
+            return self.get_from_shard(index, key)
+
+    # adds new key/value pair or updates existing key
+    def set(self, key, value):
+        index = self.shard_index(key)
+        with self.locks[index]:
+            self.set_in_shard(index, key, value)
+
+    # group positions of keys by segment so each segment lock taken once per batch
+    def group_by_shard(self, keys):
+        groups = defaultdict(list)
+        for position, key in enumerate(keys):
+            groups[self.shard_index(key)].append(position)
+        return groups
+
+    # returns values for keys in input order, -1 for missing keys
+    def get_many(self, keys):
+        keys = list(keys)
+        result = [-1] * len(keys)
+
+        for index, positions in self.group_by_shard(keys).items():
+            with self.locks[index]:
+                for position in positions:
+                    result[position] = self.get_from_shard(index, keys[position])
+
+        return result
+
+    # adds or updates every (key, value) pair, later pairs win for duplicate keys
+    def set_many(self, pairs):
+        pairs = list(pairs)
+
+        for index, positions in self.group_by_shard([key for key, _ in pairs]).items():
+            with self.locks[index]:
+                for position in positions:
+                    key, value = pairs[position]
+                    self.set_in_shard(index, key, value)
+
+    # number of entries currently held across all segments
+    def __len__(self):
+        return sum(self.occupancy())
+
+    # entries held by each segment, useful for spotting skewed key distributions
+    def occupancy(self):
+        sizes = []
+        for index in range(self.shard_count):
+            with self.locks[index]:
+                sizes.append(len(self.shards[index].cache_map))
+        return sizes
+
+    # snapshot of counters summed across segments
+    def stats(self):
+        hits = misses = evictions = 0
+        for index in range(self.shard_count):
+            with self.locks[index]:
+                hits += self.hits[index]
+                misses += self.misses[index]
+                evictions += self.evictions[index]
+
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'occupancy': self.occupancy(),
+        }
+
+    # zero all counters without touching cached entries
+    def reset_stats(self):
+        for index in range(self.shard_count):
+            with self.locks[index]:
+                self.hits[index] = self.misses[index] = self.evictions[index] = 0
+
 '''
 statement: implement a Random Set data structure that can perform the following operations:
 
@@ -461,6 +1231,97 @@ class NaiveRandomSet:
         if not self.store:
             raise ValueError("Cannot fetch from an empty set")
         return choice(self.store)
+
+'''
+weighted random set: RandomSet where every value carries non negative weight and get_random returns 
+value w probability weight / total weight, values can still be inserted, deleted and reweighted
+
+- slots: values stored in array like RandomSet, delete swaps last value into freed slot 
+- weights: FenwickNumArray over slot weights, sampling draws r in [0, total) and descends tree to 
+  slot whose prefix range contains r, moving last value only rewrites weight of one slot
+- sample_many(k): k draws w replacement, large k sorts targets and sweeps slots once instead of 
+  k tree descents
+
+time: insert, delete, reweight, get_random O(logn), sample_many O(min(k logn, n + k logk)), space O(n)
+'''
+from random import random as uniform, shuffle
+
+class WeightedRandomSet:
+    def __init__(self):
+        self.indexor = {} # maps value to its slot 
+        self.store = [] # values by slot 
+        self.weights = FenwickNumArray([]) # weight of each slot 
+
+    # inserts value w weight, returns True if it was not already present 
+    def insert(self, val, weight=1):
+        if weight < 0:
+            raise ValueError("weight must be non negative")
+        if val in self.indexor:
+            return False
+
+        self.indexor[val] = len(self.store)
+        self.store.append(val)
+        self.weights.append(weight)
+        return True
+
+    # removes value, returns True if it was present 
+    def delete(self, val):
+        if val not in self.indexor:
+            return False
+
+        # move last value into slot of deleted one, same swap as RandomSet.delete 
+        last, i = self.store[-1], self.indexor[val]
+        last_weight = self.weights.pop()
+        self.store[i], self.indexor[last] = last, i
+        if i < len(self.weights.nums):
+            self.weights.update(i, last_weight)
+
+        del self.indexor[val]
+        self.store.pop()
+        return True
+
+    # changes weight of value, returns True if it was present 
+    def reweight(self, val, weight):
+        if weight < 0:
+            raise ValueError("weight must be non negative")
+        if val not in self.indexor:
+            return False
+        self.weights.update(self.indexor[val], weight)
+        return True
+
+    # total weight of all values 
+    def total_weight(self):
+        return self.weights.prefix_sum(len(self.store))
+
+    # one value chosen w probability proportional to its weight 
+    def get_random(self):
+        total = self.total_weight()
+        if not self.store or total <= 0:
+            raise ValueError("Cannot fetch from an empty set")
+        return self.store[self.weights.search(uniform() * total)]
+
+    # k values drawn w replacement, each w probability proportional to its weight 
+    def sample_many(self, k):
+        total = self.total_weight()
+        if k and (not self.store or total <= 0):
+            raise ValueError("Cannot fetch from an empty set")
+
+        if k * max(1, len(self.store).bit_length()) < len(self.store):
+            return [self.store[self.weights.search(uniform() * total)] for _ in range(k)]
+
+        # sorted targets let one sweep over slot weights answer every draw 
+        targets = sorted(uniform() * total for _ in range(k))
+        result = []
+        slot, running = 0, self.weights.nums[0] if self.store else 0
+        for target in targets:
+            while running <= target and slot < len(self.store) - 1:
+                slot += 1
+                running += self.weights.nums[slot]
+            result.append(self.store[slot])
+
+        # sweep yields draws in slot order, shuffle so order carries no information 
+        shuffle(result)
+        return result
     
 '''
 statement: design a custom stack class, Min Stack, allowing us to push, pop, and retrieve 
@@ -625,7 +1486,181 @@ class RangeModule():
         
         # replace overlapping ranges with new ranges
         self.ranges[min_range: max_range + 1] = updated_ranges
-        
+
+'''
+balanced range module: same contract as RangeModule but ranges live in treap (binary search tree 
+ordered by range start, heap ordered by random priority) so tree stays balanced w/ out rotations
+
+every update splits tree around [left, right), ranges absorbed by add or cut by remove all sit in 
+one split out subtree which is dropped whole, so work does not grow w number of ranges merged, 
+each node also stores total covered length of its subtree so covered_length() reads it at root
+
+    add_range / remove_range / query_range: O(logn) expected
+    add_ranges(ranges) / query_ranges(ranges): batch versions, O(k logn)
+    covered_length(): total length of tracked ranges, O(1)
+
+space O(n)
+'''
+
+class RangeNode:
+    __slots__ = ('start', 'end', 'priority', 'left', 'right', 'total')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.total = end - start
+
+class BalancedRangeModule:
+
+    def __init__(self):
+        self.root = None
+
+    # recompute covered length of subtree after its children changed 
+    def update(self, node):
+        node.total = node.end - node.start
+        if node.left:
+            node.total += node.left.total
+        if node.right:
+            node.total += node.right.total
+        return node
+
+    # split tree into ranges starting before key and the rest, inclusive moves start == key left 
+    def split(self, node, key, inclusive=False):
+        if not node:
+            return None, None
+
+        if node.start < key or (inclusive and node.start == key):
+            node.right, rest = self.split(node.right, key, inclusive)
+            return self.update(node), rest
+
+        before, node.left = self.split(node.left, key, inclusive)
+        return before, self.update(node)
+
+    # join two trees where every range of first starts before every range of second 
+    def merge(self, first, second):
+        if not first or not second:
+            return first or second
+
+        if first.priority > second.priority:
+            first.right = self.merge(first.right, second)
+            return self.update(first)
+
+        second.left = self.merge(first, second.left)
+        return self.update(second)
+
+    # last range of tree 
+    def last(self, node):
+        while node and node.right:
+            node = node.right
+        return node
+
+    # detach last range from tree, returns (rest of tree, last range) 
+    def pop_last(self, node):
+        last = self.last(node)
+        if not last:
+            return node, None
+        return self.split(node, last.start)
+
+    # adds [left, right), merging w ranges it overlaps or touches 
+    def add_range(self, left, right):
+        if left >= right:
+            return
+
+        before, after = self.split(self.root, left)
+
+        # range starting before left absorbed if it reaches left 
+        before, last = self.pop_last(before)
+        if last and last.end >= left:
+            left, right = last.start, max(right, last.end)
+        elif last:
+            before = self.merge(before, last)
+
+        # every range starting inside [left, right] absorbed, only last one can reach past right 
+        covered, after = self.split(after, right, inclusive=True)
+        if covered:
+            right = max(right, self.last(covered).end)
+
+        self.root = self.merge(self.merge(before, RangeNode(left, right)), after)
+
+    # checks if every number in [left, right) is tracked 
+    def query_range(self, left, right):
+        if left >= right:
+            return True
+
+        # find range w largest start at or before left 
+        node, candidate = self.root, None
+        while node:
+            if node.start <= left:
+                candidate = node
+                node = node.right
+            else:
+                node = node.left
+
+        return candidate is not None and candidate.end >= right
+
+    # stops tracking every number in [left, right) 
+    def remove_range(self, left, right):
+        if left >= right:
+            return
+
+        before, after = self.split(self.root, left)
+        pieces = []
+
+        # range starting before left keeps its part before left and any part after right 
+        before, last = self.pop_last(before)
+        if last and last.end > left:
+            pieces.append(RangeNode(last.start, left))
+            if last.end > right:
+                pieces.append(RangeNode(right, last.end))
+        elif last:
+            before = self.merge(before, last)
+
+        # ranges starting inside [left, right) dropped, last one may keep part after right 
+        covered, after = self.split(after, right)
+        if covered and self.last(covered).end > right:
+            pieces.append(RangeNode(right, self.last(covered).end))
+
+        for piece in pieces:
+            before = self.merge(before, piece)
+        self.root = self.merge(before, after)
+
+    # adds many ranges, sorted and coalesced first so overlapping batch entries cost one insert 
+    def add_ranges(self, ranges):
+        merged = []
+        for left, right in sorted(ranges):
+            if left >= right:
+                continue
+            if merged and left <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], right)
+            else:
+                merged.append([left, right])
+
+        for left, right in merged:
+            self.add_range(left, right)
+
+    # query_range for every (left, right) in ranges 
+    def query_ranges(self, ranges):
+        return [self.query_range(left, right) for left, right in ranges]
+
+    # total length covered by tracked ranges 
+    def covered_length(self):
+        return self.root.total if self.root else 0
+
+    # tracked ranges in increasing order 
+    def get_ranges(self):
+        result, stack, node = [], [], self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append((node.start, node.end))
+            node = node.right
+        return result
+
 '''
 statement: design a data structure that takes in an array of strings and efficiently computes 
 the shortest distance between any two different strings in the array, implement the WordDistance class:
@@ -635,6 +1670,7 @@ the shortest distance between any two different strings in the array, implement
     and word2 in the array of strings
 '''
 
+from bisect import bisect_right
 from collections import defaultdict
 
 class WordDistance(object):
@@ -672,6 +1708,74 @@ class WordDistance(object):
                 j += 1 
 
         return min_distance
+
+'''
+cached word distance: WordDistance re-merges both index lists on every query, for repeated queries 
+over streaming corpus:
+
+    - memo: answers kept in LRUCache keyed by unordered word pair, bounded by cache_capacity
+    - galloping: when one list is gallop_ratio times longer than other, binary search each index of 
+      short list in long list and only compare neighbours, O(m log n) instead of O(m + n)
+    - shortest_many(pairs): shortest for every (word1, word2) pair
+    - append_words(words): extends index lists w/ out rebuilding, drops memo entries of pairs that 
+      involve appended words since only those can change
+
+time: shortest O(1) on memo hit, O(min(m + n, m log n)) otherwise, space O(N + cache_capacity)
+'''
+
+class CachedWordDistance(WordDistance):
+
+    def __init__(self, words_dict, cache_capacity=1024, gallop_ratio=8):
+        super().__init__(words_dict)
+        self.length = len(words_dict)
+        self.gallop_ratio = gallop_ratio
+        self.memo = LRUCache(cache_capacity)
+
+    # closest pair w one index from short list and one from long list, both sorted 
+    def gallop(self, short, long):
+        min_distance = float('inf')
+        low = 0
+        for index in short:
+            # indexes of short increase, so search never has to look left of previous hit 
+            position = bisect_right(long, index, low)
+            if position < len(long):
+                min_distance = min(min_distance, long[position] - index)
+            if position > 0:
+                min_distance = min(min_distance, index - long[position - 1])
+            low = max(0, position - 1)
+        return min_distance
+
+    def shortest(self, word1, word2):
+        key = (word1, word2) if word1 <= word2 else (word2, word1)
+        cached = self.memo.get(key)
+        if cached != -1:
+            return cached
+
+        indices1, indices2 = self.word_indices.get(word1, []), self.word_indices.get(word2, [])
+        short, long = sorted((indices1, indices2), key=len)
+        if short and len(long) >= self.gallop_ratio * len(short):
+            distance = self.gallop(short, long)
+        else:
+            distance = super().shortest(word1, word2)
+
+        self.memo.set(key, distance)
+        return distance
+
+    # shortest for every (word1, word2) pair 
+    def shortest_many(self, pairs):
+        return [self.shortest(word1, word2) for word1, word2 in pairs]
+
+    # add words to end of corpus 
+    def append_words(self, words):
+        appended = set()
+        for word in words:
+            self.word_indices[word].append(self.length)
+            self.length += 1
+            appended.add(word)
+
+        # only pairs w an appended word can get closer 
+        for key in [key for key in self.memo.cache_map if key[0] in appended or key[1] in appended]:
+            self.memo.delete(key)
     
 '''
 statement: design a MyHashSet class without using any built-in hash table libraries and implement 
@@ -800,6 +1904,152 @@ class MyHashSet:
         bucket_index = self.hash(key)
         return self.bucket_array[bucket_index].contains(key)
 
+'''
+open addressing hash set: same add/remove/contains API as MyHashSet but keys stored directly in flat 
+array('q') table w parallel array('B') of slot states (empty, full, deleted), no buckets or trees
+
+- hash function: multiplicative (Fibonacci) hashing takes top bits of key * 2^64/golden ratio, 
+  so sequential keys or keys sharing low bits still spread across table 
+- collision handling: linear probing, walk to next slot until key or empty slot found
+- removal leaves tombstone so probe chains through slot stay intact, insert reuses first tombstone 
+  seen on its probe path
+- rehash: when full + tombstone slots pass max_load table rebuilt, doubled if live keys alone need 
+  it, otherwise same size, which drops every tombstone (compaction), halved when mostly empty
+
+keys must fit in signed 64-bit integer
+
+time O(1) average per operation, space O(n)
+'''
+
+class OpenAddressingHashSet:
+    EMPTY, FULL, DELETED = 0, 1, 2
+
+    def __init__(self, capacity=8, max_load=0.7):
+        self.max_load = max_load
+        self.allocate(max(8, 1 << (capacity - 1).bit_length()))
+        self.size = 0
+
+    # fresh empty table w given power of 2 number of slots 
+    def allocate(self, capacity):
+        self.capacity = capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.keys = array('q', [0]) * capacity
+        self.states = array('B', [self.EMPTY]) * capacity
+        self.tombstones = 0
+
+    # home slot of key 
+    def hash(self, key) -> int:
+        return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    # slot holding key or -1 
+    def find(self, key):
+        keys, states, mask = self.keys, self.states, self.capacity - 1
+        index = self.hash(key)
+
+        # table always keeps empty slots, so probe ends 
+        while states[index] != self.EMPTY:
+            if states[index] == self.FULL and keys[index] == key:
+                return index
+            index = (index + 1) & mask
+        return -1
+
+    # rebuild table w new capacity, reinserting only live keys 
+    def rehash(self, capacity):
+        old_keys, old_states = self.keys, self.states
+        self.allocate(capacity)
+        keys, states, mask = self.keys, self.states, capacity - 1
+
+        for key, state in zip(old_keys, old_states):
+            if state == self.FULL:
+                index = self.hash(key)
+                while states[index] == self.FULL:
+                    index = (index + 1) & mask
+                keys[index] = key
+                states[index] = self.FULL
+
+    # add key to hash set 
+    def add(self, key):
+        keys, states, mask = self.keys, self.states, self.capacity - 1
+        index = self.hash(key)
+        tombstone = -1
+
+        while states[index] != self.EMPTY:
+            if states[index] == self.FULL:
+                if keys[index] == key:
+                    return
+            elif tombstone == -1:
+                tombstone = index
+            index = (index + 1) & mask
+
+        # reuse first tombstone on probe path 
+        if tombstone != -1:
+            index = tombstone
+            self.tombstones -= 1
+        keys[index] = key
+        states[index] = self.FULL
+        self.size += 1
+
+        if self.size + self.tombstones > self.capacity * self.max_load:
+            # grow only if live keys need room, otherwise same size rebuild clears tombstones 
+            grow = self.size > self.capacity * self.max_load / 2
+            self.rehash(self.capacity * 2 if grow else self.capacity)
+
+    # remove key from hash set 
+    def remove(self, key):
+        index = self.find(key)
+        if index == -1:
+            return
+
+        self.states[index] = self.DELETED
+        self.size -= 1
+        self.tombstones += 1
+
+        # shrink once table mostly empty 
+        if self.capacity > 8 and self.size < self.capacity * self.max_load / 8:
+            self.rehash(self.capacity // 2)
+
+    # check if hash set contains key 
+    def contains(self, key):
+        return self.find(key) != -1
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for key, state in zip(self.keys, self.states):
+            if state == self.FULL:
+                yield key
+
+# time add, contains and remove of n keys for MyHashSet, OpenAddressingHashSet and built in set 
+def benchmark_hash_sets(n=50000, seed=7):
+    generator = random.Random(seed)
+    workloads = [
+        ('sequential', list(range(n))),
+        ('random', [generator.randrange(-2 ** 40, 2 ** 40) for _ in range(n)]),
+    ]
+
+    # built in set uses method names add/discard/__contains__ 
+    class BuiltinSet(set):
+        contains = set.__contains__
+        remove = set.discard
+
+    results = {}
+    for workload, keys in workloads:
+        for name, make in [('MyHashSet', MyHashSet), ('OpenAddressingHashSet', OpenAddressingHashSet),
+                           ('set', BuiltinSet)]:
+            hash_set = make()
+            timings = []
+            for operation in ('add', 'contains', 'remove'):
+                method = getattr(hash_set, operation)
+                start = time.perf_counter()
+                for key in keys:
+                    method(key)
+                timings.append(time.perf_counter() - start)
+
+            results[(workload, name)] = timings
+            print(f"{workload:<11}{name:<23}add {timings[0]:.3f}s\tcontains {timings[1]:.3f}s\tremove {timings[2]:.3f}s")
+    return results
+
 '''
 statement: design a custom stack class, Max Stack, that supports the basic stack operations 
 and can find the maximum element present in the stack, implement the following methods for Max Stack:
@@ -870,6 +2120,140 @@ class MaxStack:
         self.popped.add(-idx)
         return -num  # return the max value
 
+'''
+eager max stack: lazy version above never forgets popped IDs, so under push/popMax churn popped set 
+and max heap keep growing and top/peekMax may walk long runs of dead entries, here every element 
+lives in exactly two places and is removed from both as soon as it is popped:
+
+    - stack order: DoublyLinkedList of StackNode, top of stack is tail, node unlinked in O(1)
+    - max order: indexed binary max heap of same nodes ordered by (value, id), each node remembers 
+      its heap position so pop can delete it from middle of heap w/ out search
+
+ties on value broken by higher id, so popMax removes most recently pushed maximum
+
+time: push, pop, popMax O(logn), top, peekMax O(1), space O(n) where n = live elements
+'''
+import tracemalloc
+
+class StackNode:
+    __slots__ = ('key', 'value', 'position', 'next', 'previous')
+
+    def __init__(self, key, value):
+        self.key = key # push id, breaks ties between equal values 
+        self.value = value
+        self.position = -1 # index in max heap 
+        self.next = None
+        self.previous = None
+
+class EagerMaxStack:
+    def __init__(self):
+        self.stack = DoublyLinkedList()
+        self.max_heap = []
+        self.id_num = 0
+
+    # check if node a ranks above node b in max heap 
+    def higher(self, a, b):
+        return (a.value, a.key) > (b.value, b.key)
+
+    # place node at heap index and record its position 
+    def place(self, node, index):
+        self.max_heap[index] = node
+        node.position = index
+
+    # move node at index up while it outranks its parent 
+    def sift_up(self, index):
+        node = self.max_heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not self.higher(node, self.max_heap[parent]):
+                break
+            self.place(self.max_heap[parent], index)
+            index = parent
+        self.place(node, index)
+
+    # move node at index down while a child outranks it 
+    def sift_down(self, index):
+        heap, node = self.max_heap, self.max_heap[index]
+        size = len(heap)
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and self.higher(heap[child + 1], heap[child]):
+                child += 1
+            if not self.higher(heap[child], node):
+                break
+            self.place(heap[child], index)
+            index = child
+        self.place(node, index)
+
+    # delete node from any heap position: swap in last node and restore heap order 
+    def heap_remove(self, node):
+        last = self.max_heap.pop()
+        if last is not node:
+            index = node.position
+            self.place(last, index)
+            self.sift_up(index)
+            self.sift_down(last.position)
+        node.position = -1
+
+    # pushes value onto stack, time O(logn) 
+    def push(self, x):
+        node = StackNode(self.id_num, x)
+        self.id_num += 1
+        self.stack.insert_at_tail(node)
+        self.max_heap.append(node)
+        self.sift_up(len(self.max_heap) - 1)
+
+    # removes and returns top element of stack, time O(logn) 
+    def pop(self):
+        node = self.stack.tail
+        self.stack.detach_node(node)
+        self.heap_remove(node)
+        return node.value
+
+    # returns top element of stack, time O(1) 
+    def top(self):
+        return self.stack.tail.value
+
+    # returns max element of stack, time O(1) 
+    def peekMax(self):
+        return self.max_heap[0].value
+
+    # removes and returns max element, most recently pushed one on ties, time O(logn) 
+    def popMax(self):
+        node = self.max_heap[0]
+        self.heap_remove(node)
+        self.stack.detach_node(node)
+        return node.value
+
+    def __len__(self):
+        return len(self.max_heap)
+
+# push/popMax churn on fixed number of live elements, reports traced memory every report_every rounds 
+def benchmark_max_stack_churn(live=1000, rounds=200000, report_every=50000, seed=7):
+    results = {}
+    for name, make in [('MaxStack', MaxStack), ('EagerMaxStack', EagerMaxStack)]:
+        generator = random.Random(seed)
+        tracemalloc.start()
+        max_stack = make()
+        for _ in range(live):
+            max_stack.push(generator.randrange(1000000))
+
+        samples = []
+        start = time.perf_counter()
+        for i in range(1, rounds + 1):
+            max_stack.push(generator.randrange(1000000))
+            max_stack.popMax()
+            if i % report_every == 0:
+                samples.append(tracemalloc.get_traced_memory()[0])
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+
+        results[name] = samples
+        print(f"{name:<14}{elapsed:.2f}s\tmemory (KiB): " + ", ".join(str(sample // 1024) for sample in samples))
+    return results
+
 '''
 statement: given a stream of integers and a window size, calculate the moving average 
 of all integers in the sliding window, implement a class called MovingAverage that has the following methods:
@@ -905,6 +2289,226 @@ class MovingAverage:
         # return window sum divided by current queue length to obtain moving average 
         return float(self.window_sum) / len(self.queue)
 
+'''
+windowed aggregator: generalises MovingAverage to count, mean, min, max and variance over same window
+
+    - window: last size values (count based), values newer than duration (time based), or both
+    - min/max: monotonic deques like find_max_sliding_window in sliding_window.py, max deque keeps 
+      decreasing values, min deque increasing, front of each is answer, each value enters and leaves 
+      each deque once
+    - variance: Welford running mean and sum of squared deviations (m2), updated when value enters 
+      and reversed when value leaves, avoids catastrophic cancellation of sum of squares approach
+
+WindowAggregator tracks one series as MovingAverage subclass, SeriesWindowAggregator tracks many 
+series in flat arrays (one ring buffer slice per series) so thousands of series cost no per series 
+Python objects, fed in batches w push_many(series_ids, values)
+
+time O(1) amortized per value, space O(size) per series
+'''
+from operator import gt, lt
+
+class WindowAggregator(MovingAverage):
+
+    def __init__(self, size=None, duration=None):
+        if size is None and duration is None:
+            raise ValueError("window needs size, duration or both")
+        super().__init__(size)
+        self.duration = duration
+        self.timestamps = deque() # parallel to queue, only used for time based windows 
+        self.pushed = 0 # number of values ever pushed, sequence number of next value 
+        self.max_window = deque() # (sequence, value), values decreasing 
+        self.min_window = deque() # (sequence, value), values increasing 
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    # adds value, timestamp defaults to monotonic clock for time based windows 
+    def push(self, val, timestamp=None):
+        sequence = self.pushed
+        self.pushed += 1
+
+        self.queue.append(val)
+        self.window_sum += val
+        if self.duration is not None:
+            timestamp = time.monotonic() if timestamp is None else timestamp
+            self.timestamps.append(timestamp)
+
+        # Welford update for value entering window 
+        delta = val - self.mean
+        self.mean += delta / len(self.queue)
+        self.m2 += delta * (val - self.mean)
+
+        # same clean up as find_max_sliding_window, drop values that can never be answer again 
+        while self.max_window and self.max_window[-1][1] <= val:
+            self.max_window.pop()
+        self.max_window.append((sequence, val))
+        while self.min_window and self.min_window[-1][1] >= val:
+            self.min_window.pop()
+        self.min_window.append((sequence, val))
+
+        self.expire(timestamp)
+
+    # drops oldest values until window fits size and duration 
+    def expire(self, now=None):
+        while self.size is not None and len(self.queue) > self.size:
+            self.remove_oldest()
+
+        if self.duration is not None:
+            now = time.monotonic() if now is None else now
+            while self.timestamps and self.timestamps[0] <= now - self.duration:
+                self.remove_oldest()
+
+    # removes oldest value from window and every statistic 
+    def remove_oldest(self):
+        sequence = self.pushed - len(self.queue)
+        val = self.queue.popleft()
+        self.window_sum -= val
+        if self.duration is not None:
+            self.timestamps.popleft()
+
+        # reverse Welford update for value leaving window 
+        if self.queue:
+            delta = val - self.mean
+            self.mean -= delta / len(self.queue)
+            self.m2 -= delta * (val - self.mean)
+        else:
+            self.mean = self.m2 = 0.0
+
+        if self.max_window[0][0] == sequence:
+            self.max_window.popleft()
+        if self.min_window[0][0] == sequence:
+            self.min_window.popleft()
+
+    # MovingAverage contract: add value, return mean of window 
+    def next(self, val, timestamp=None):
+        self.push(val, timestamp)
+        return float(self.window_sum) / len(self.queue) if self.queue else 0.0
+
+    # count, mean, min, max and population variance of current window 
+    def stats(self):
+        count = len(self.queue)
+        return {
+            'count': count,
+            'mean': self.mean if count else 0.0,
+            'min': self.min_window[0][1] if count else None,
+            'max': self.max_window[0][1] if count else None,
+            'variance': max(0.0, self.m2 / count) if count else 0.0,
+        }
+
+class SeriesWindowAggregator:
+
+    def __init__(self, num_series, size, duration=None):
+        # ring buffers need fixed capacity, so size required, duration can shrink window further 
+        self.num_series = num_series
+        self.size = size
+        self.duration = duration
+
+        # series s owns slots s * size .. s * size + size - 1 of every ring 
+        self.values = array('d', [0.0]) * (num_series * size)
+        self.timestamps = array('d', [0.0]) * (num_series * size) if duration is not None else None
+        self.max_ring = array('q', [0]) * (num_series * size) # sequence numbers, values decreasing 
+        self.min_ring = array('q', [0]) * (num_series * size) # sequence numbers, values increasing 
+
+        # per series scalars 
+        self.start = array('q', [0]) * num_series # sequence of oldest value in window 
+        self.pushed = array('q', [0]) * num_series # sequence of next value 
+        self.means = array('d', [0.0]) * num_series
+        self.m2s = array('d', [0.0]) * num_series
+        self.max_head = array('q', [0]) * num_series
+        self.max_len = array('q', [0]) * num_series
+        self.min_head = array('q', [0]) * num_series
+        self.min_len = array('q', [0]) * num_series
+
+    # ring slot of given sequence number of series 
+    def slot(self, series, sequence):
+        return series * self.size + sequence % self.size
+
+    # remove oldest value of series from window and every statistic 
+    def remove_oldest(self, series):
+        sequence = self.start[series]
+        val = self.values[self.slot(series, sequence)]
+        self.start[series] = sequence + 1
+
+        count = self.pushed[series] - self.start[series]
+        if count:
+            delta = val - self.means[series]
+            self.means[series] -= delta / count
+            self.m2s[series] -= delta * (val - self.means[series])
+        else:
+            self.means[series] = self.m2s[series] = 0.0
+
+        base = series * self.size
+        if self.max_len[series] and self.max_ring[base + self.max_head[series]] == sequence:
+            self.max_head[series] = (self.max_head[series] + 1) % self.size
+            self.max_len[series] -= 1
+        if self.min_len[series] and self.min_ring[base + self.min_head[series]] == sequence:
+            self.min_head[series] = (self.min_head[series] + 1) % self.size
+            self.min_len[series] -= 1
+
+    # append sequence to back of monotonic ring after popping entries it makes useless 
+    def push_monotonic(self, ring, heads, lengths, series, sequence, val, keep):
+        base = series * self.size
+        head, length = heads[series], lengths[series]
+        while length and not keep(self.values[self.slot(series, ring[base + (head + length - 1) % self.size])], val):
+            length -= 1
+        ring[base + (head + length) % self.size] = sequence
+        lengths[series] = length + 1
+
+    # adds value to series, timestamp required for time based windows 
+    def push(self, series, val, timestamp=None):
+        # ring full, oldest value must leave before its slot is reused 
+        if self.pushed[series] - self.start[series] == self.size:
+            self.remove_oldest(series)
+
+        sequence = self.pushed[series]
+        slot = self.slot(series, sequence)
+        self.values[slot] = val
+        if self.timestamps is not None:
+            self.timestamps[slot] = timestamp
+        self.pushed[series] = sequence + 1
+
+        # Welford update for value entering window 
+        count = sequence + 1 - self.start[series]
+        delta = val - self.means[series]
+        self.means[series] += delta / count
+        self.m2s[series] += delta * (val - self.means[series])
+
+        # max ring keeps back values strictly greater than new one, min ring strictly smaller 
+        self.push_monotonic(self.max_ring, self.max_head, self.max_len, series, sequence, val, gt)
+        self.push_monotonic(self.min_ring, self.min_head, self.min_len, series, sequence, val, lt)
+
+        if self.timestamps is not None:
+            self.expire(series, timestamp)
+
+    # drop values of series older than duration before now 
+    def expire(self, series, now):
+        while (self.pushed[series] > self.start[series]
+               and self.timestamps[self.slot(series, self.start[series])] <= now - self.duration):
+            self.remove_oldest(series)
+
+    # batch version of push, series_ids[i] receives values[i] 
+    def push_many(self, series_ids, values, timestamps=None):
+        if timestamps is None:
+            for series, val in zip(series_ids, values):
+                self.push(series, val)
+        else:
+            for series, val, timestamp in zip(series_ids, values, timestamps):
+                self.push(series, val, timestamp)
+
+    # count, mean, min, max and population variance of series window 
+    def stats(self, series):
+        count = self.pushed[series] - self.start[series]
+        if not count:
+            return {'count': 0, 'mean': 0.0, 'min': None, 'max': None, 'variance': 0.0}
+
+        base = series * self.size
+        return {
+            'count': count,
+            'mean': self.means[series],
+            'min': self.values[self.slot(series, self.min_ring[base + self.min_head[series]])],
+            'max': self.values[self.slot(series, self.max_ring[base + self.max_head[series]])],
+            'variance': max(0.0, self.m2s[series] / count),
+        }
+
 '''
 statement: design a data structure that takes in a stream of numbers and can check 
 if any two numbers add up to a specific value, implement the TwoSum class with the 
@@ -945,6 +2549,63 @@ class TwoSum:
                     # if length of hash map and set is the same, return True (frequencies of each element unique)
                     return True 
         return False 
+
+'''
+read optimized TwoSum: for workloads w far more finds than adds, keep set of every achievable pair 
+sum so find is one set lookup, each add of new distinct number x inserts x + y for every distinct y 
+already stored (and 2x once x seen twice)
+
+set of sums grows up to O(N^2), max_sums caps it, once an add would pass cap set is dropped for good 
+and find falls back to TwoSum scan
+
+time: add O(N) while sums kept, O(1) after fallback, find O(1) while sums kept, O(N) after fallback
+space O(min(N^2, max_sums))
+'''
+
+class ReadOptimizedTwoSum(TwoSum):
+    def __init__(self, max_sums=1000000):
+        super().__init__()
+        self.max_sums = max_sums
+        self.sums = set() # every achievable pair sum, None once cap exceeded 
+
+    # adds number and every new pair sum it makes 
+    def add(self, number):
+        if self.sums is not None:
+            if number in self.nums:
+                # second copy only adds number + number, pairs w others already recorded 
+                self.sums.add(2 * number)
+            elif len(self.sums) + len(self.nums) > self.max_sums:
+                # could pass cap, stop maintaining sums and answer by scanning 
+                self.sums = None
+            else:
+                for num in self.nums:
+                    self.sums.add(number + num)
+        super().add(number)
+
+    # returns True if any two stored numbers add up to value 
+    def find(self, value):
+        if self.sums is not None:
+            return value in self.sums
+        return super().find(value)
+
+    # find for every value in batch 
+    def find_many(self, values):
+        if self.sums is not None:
+            sums = self.sums
+            return [value in sums for value in values]
+
+        # fallback: one pass over numbers answers every distinct query still open 
+        answers = {}
+        pending = set(values)
+        for num, count in self.nums.items():
+            if not pending:
+                break
+            found = [value for value in pending
+                     if (value - num) in self.nums and (value - num != num or count > 1)]
+            for value in found:
+                answers[value] = True
+            pending.difference_update(found)
+        return [answers.get(value, False) for value in values]
     
 '''
 statement: you are given an integer array, nums, and you need to handle multiple queries of the following type:
@@ -977,6 +2638,175 @@ class NumArray:
         # return sum of elements between indices i and j inclusive 
         return self.sum[right + 1] - self.sum[left] # result of subtraction as sum of elements from i to j 
 
+'''
+mutable NumArray: prefix sum array above answers sum_range in O(1) but any change to nums forces O(n) 
+rebuild, both classes below also support update(i, val) by keeping partial sums in tree instead
+
+- FenwickNumArray (binary indexed tree): tree[i] holds sum of nums over (i - lowbit(i), i], prefix 
+  sum walks down by clearing lowest set bit, update walks up by adding it
+- SegmentTreeNumArray: iterative bottom up segment tree, leaves at n..2n - 1 and parent of node i 
+  at i // 2, keeps sum, min and max of every node so also answers min_range and max_range
+
+both offer update_many(updates) for list of (index, value) pairs and sum_ranges(ranges) for list of 
+(left, right) pairs, left and right inclusive like sum_range
+
+time: constructor O(n), update O(logn), sum_range O(logn), space O(n)
+'''
+from operator import add
+
+class FenwickNumArray:
+
+    def __init__(self, nums):
+        self.nums = list(nums)
+        self.build()
+
+    # O(n) construction, each node pushes its sum to its parent once 
+    def build(self):
+        n = len(self.nums)
+        self.tree = [0] + self.nums
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+
+    # sum of nums[0..index - 1] 
+    def prefix_sum(self, index):
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    # set nums[index] to val 
+    def update(self, index, val):
+        delta = val - self.nums[index]
+        self.nums[index] = val
+
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    # sum of elements between indices left and right inclusive 
+    def sum_range(self, left, right):
+        return self.prefix_sum(right + 1) - self.prefix_sum(left)
+
+    # apply (index, value) updates, large batches rebuild tree once instead of k log n updates 
+    def update_many(self, updates):
+        updates = list(updates)
+        if len(updates) * max(1, len(self.nums).bit_length()) > len(self.nums):
+            for index, val in updates:
+                self.nums[index] = val
+            self.build()
+        else:
+            for index, val in updates:
+                self.update(index, val)
+
+    # sum_range for every (left, right) pair 
+    def sum_ranges(self, ranges):
+        return [self.sum_range(left, right) for left, right in ranges]
+
+    # add val after last element, new node covers (i - lowbit(i), i] so it takes sum of that range 
+    def append(self, val):
+        self.nums.append(val)
+        i = len(self.nums)
+        self.tree.append(val + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+
+    # remove and return last element, no earlier node covers it so tree just shrinks 
+    def pop(self):
+        self.tree.pop()
+        return self.nums.pop()
+
+    # smallest index whose prefix sum through it exceeds target, nums must be non negative 
+    def search(self, target):
+        index = 0
+        step = 1 << (len(self.nums).bit_length())
+        while step:
+            # descend: take whole block if its sum still does not exceed target 
+            if index + step < len(self.tree) and self.tree[index + step] <= target:
+                index += step
+                target -= self.tree[index]
+            step >>= 1
+        return min(index, len(self.nums) - 1)
+
+class SegmentTreeNumArray:
+
+    def __init__(self, nums):
+        self.n = len(nums)
+        # node i covers children 2i and 2i + 1, leaves stored from n onwards 
+        self.sums = [0] * self.n + list(nums)
+        self.mins = [0] * self.n + list(nums)
+        self.maxs = [0] * self.n + list(nums)
+        for i in range(self.n - 1, 0, -1):
+            self.pull(i)
+
+    # recompute node from its two children 
+    def pull(self, i):
+        left, right = 2 * i, 2 * i + 1
+        self.sums[i] = self.sums[left] + self.sums[right]
+        self.mins[i] = min(self.mins[left], self.mins[right])
+        self.maxs[i] = max(self.maxs[left], self.maxs[right])
+
+    # set nums[index] to val 
+    def update(self, index, val):
+        i = index + self.n
+        self.sums[i] = self.mins[i] = self.maxs[i] = val
+        i >>= 1
+        while i >= 1:
+            self.pull(i)
+            i >>= 1
+
+    # set every leaf first, then recompute each affected ancestor once per level 
+    def update_many(self, updates):
+        parents = set()
+        for index, val in updates:
+            i = index + self.n
+            self.sums[i] = self.mins[i] = self.maxs[i] = val
+            parents.add(i >> 1)
+        parents.discard(0)
+
+        while parents:
+            # deepest level first so children are final before parent pulled 
+            deepest = max(parents).bit_length()
+            level = {i for i in parents if i.bit_length() == deepest}
+            parents -= level
+            for i in level:
+                self.pull(i)
+                if i > 1:
+                    parents.add(i >> 1)
+
+    # combine nodes covering [left, right] inclusive w given operation 
+    def query(self, values, combine, left, right):
+        result = None
+        left += self.n
+        right += self.n + 1
+        while left < right:
+            if left & 1:
+                result = values[left] if result is None else combine(result, values[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                result = values[right] if result is None else combine(result, values[right])
+            left >>= 1
+            right >>= 1
+        return result
+
+    # sum of elements between indices left and right inclusive 
+    def sum_range(self, left, right):
+        return self.query(self.sums, add, left, right)
+
+    # minimum element between indices left and right inclusive 
+    def min_range(self, left, right):
+        return self.query(self.mins, min, left, right)
+
+    # maximum element between indices left and right inclusive 
+    def max_range(self, left, right):
+        return self.query(self.maxs, max, left, right)
+
+    # sum_range for every (left, right) pair 
+    def sum_ranges(self, ranges):
+        return [self.sum_range(left, right) for left, right in ranges]
+
 '''
 statement: design and implement a data structure for a Least Frequently Used (LFU) cache, implement 
 the LFUCache class, here is how it should be implemented:
@@ -999,6 +2829,8 @@ Get and Put functions should both run with an average time complexity of O(1)
 space O(capacity)
 '''
 class Node:
+    __slots__ = ('key', 'value', 'use_counter', 'next', 'previous')
+
     def __init__(self, key, value):
         self.key = key 
         self.value = value
@@ -1054,6 +2886,8 @@ class DoubleyLinkedList:
         return False
         
 class Node:
+    __slots__ = ('key', 'value', 'use_counter', 'next', 'previous')
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
@@ -1108,15 +2942,31 @@ class DoublyLinkedList:
 from collections import defaultdict, OrderedDict
 
 class LFUCache:
-    def __init__(self, capacity: int):
+    def __init__(self, capacity: int, backend: str = 'dict', ttl=None, max_bytes=None, sizeof=None, clock=None):
         '''
         initializes LFU cache with given capacity 
+
+        backend='array' keeps entries in a shared NodePool w one ArrayLinkedList per frequency 
+        instead of three dictionaries and an OrderedDict per frequency
+
+        ttl, max_bytes and sizeof are optional limits handled by EntryLimits, same as LRUCache
         '''
         self.capacity = capacity
-        self.key_to_value = {} # map key to value 
-        self.key_to_frequency = {} # map key to frequency 
-        self.frequency_to_keys = defaultdict(OrderedDict) # map frequency to ordered dictionary of keys 
         self.min_frequency = 0  # current minimum frequency in use/tracking min frequency in cache 
+        self.pool = None
+        self.limits = EntryLimits(ttl, max_bytes, sizeof, clock)
+
+        if backend == 'array':
+            self.pool = NodePool(capacity)
+            self.key_to_index = {} # map key to slot in pool 
+            self.use_counter = array('l', [0]) * capacity # frequency of key stored in each slot 
+            self.frequency_to_list = {} # map frequency to list of slots, head = least recently used 
+        elif backend == 'dict':
+            self.key_to_value = {} # map key to value 
+            self.key_to_frequency = {} # map key to frequency 
+            self.frequency_to_keys = defaultdict(OrderedDict) # map frequency to ordered dictionary of keys 
+        else:
+            raise ValueError("unknown backend: " + str(backend))
     
     def update_frequency(self, key: int):
         '''
@@ -1126,6 +2976,9 @@ class LFUCache:
         3. if this freq bucket empty and is current min freq, increment min freq 
         4. add key to next frequency bucket (increment frequency by 1)
         '''
+        if self.pool is not None:
+            return self.update_slot_frequency(self.key_to_index[key])
+
         frequency = self.key_to_frequency[key]
         
         # remove key from current frequency bucket 
@@ -1139,6 +2992,29 @@ class LFUCache:
         # move key to next frequency bucket 
         self.key_to_frequency[key] = frequency + 1
         self.frequency_to_keys[frequency + 1][key] = None
+
+    def update_slot_frequency(self, index: int):
+        '''
+        array backend version of update_frequency, relinks slot from its frequency list to 
+        tail of next frequency list without touching pool allocation
+        '''
+        frequency = self.use_counter[index]
+        bucket = self.frequency_to_list[frequency]
+        bucket.detach_node(index)
+
+        if not bucket.size:
+            del self.frequency_to_list[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency += 1
+
+        self.use_counter[index] = frequency + 1
+        if frequency + 1 not in self.frequency_to_list:
+            self.frequency_to_list[frequency + 1] = ArrayLinkedList(self.pool)
+        self.frequency_to_list[frequency + 1].attach_at_tail(index)
+
+    # number of keys currently cached 
+    def __len__(self):
+        return len(self.key_to_index if self.pool is not None else self.key_to_value)
     
     # time O(1)
     def get(self, key: int) -> int:
@@ -1147,6 +3023,18 @@ class LFUCache:
         1. if key not in cache, return -1
         2. if key present: update frequency of key and return corresponding value 
         '''
+        # expired entry removed on read and treated as missing 
+        if self.limits.is_expired(key):
+            self.delete(key)
+            return -1
+
+        if self.pool is not None:
+            if key not in self.key_to_index:
+                return -1
+            index = self.key_to_index[key]
+            self.update_slot_frequency(index)
+            return self.pool.values[index]
+
         if key not in self.key_to_value:
             return -1  # return -1 if the key does not exist
         
@@ -1156,7 +3044,7 @@ class LFUCache:
     
     # if key present, update it, otherwise insert key
     # update use counter for key, time O(1)
-    def put(self, key: int, value: int) -> None:
+    def put(self, key: int, value: int, ttl=None) -> None:
         '''
         adds key/value pair to cache or updates value of existing key
         1. if cache capacity 0, do nothing 
@@ -1166,10 +3054,32 @@ class LFUCache:
             (with tie-breaking for least recently used)
             - insert new key with frequency 1 
             - reset minimum frequency to 1 
+        4. value bigger than whole byte budget rejected up front, cache left untouched 
+        5. track expiry and size, evict LFU keys other than this one until values fit byte budget
         '''
         if self.capacity == 0:
             return
-        
+
+        # value bigger than whole byte budget is rejected before cache changes 
+        size = self.limits.measure(value)
+        if not self.limits.fits(size):
+            return
+
+        # drop bounded batch of expired entries so they do not take room from live ones 
+        self.sweep()
+
+        if self.pool is not None:
+            self.put_slot(key, value)
+        else:
+            self.put_key(key, value)
+
+        self.limits.record(key, size, ttl)
+
+        while self.limits.over_budget():
+            self.evict(protect=key)
+
+    # dict backend version of put 
+    def put_key(self, key, value):
         if key in self.key_to_value:
             # update the value of the existing key and its frequency
             self.key_to_value[key] = value 
@@ -1182,6 +3092,7 @@ class LFUCache:
                 # remove evicted key from all maps 
                 del self.key_to_value[evict_key]
                 del self.key_to_frequency[evict_key]
+                self.limits.forget(evict_key)
             
             # insert new key with frequency 1 
             self.key_to_value[key] = value
@@ -1189,3 +3100,300 @@ class LFUCache:
             self.frequency_to_keys[1][key] = None 
             # reset minimum frequency to 1 
             self.min_frequency = 1
+
+    # array backend version of put, evicted slot goes back to free list and is reused by new key 
+    def put_slot(self, key, value):
+        if key in self.key_to_index:
+            index = self.key_to_index[key]
+            self.pool.values[index] = value
+            self.update_slot_frequency(index)
+            return
+
+        # evict head of minimum frequency list if cache full 
+        if len(self.key_to_index) == self.capacity:
+            bucket = self.frequency_to_list[self.min_frequency]
+            evict_key = bucket.remove_head_node()
+            del self.key_to_index[evict_key]
+            self.limits.forget(evict_key)
+            if not bucket.size:
+                del self.frequency_to_list[self.min_frequency]
+
+        # insert new key with frequency 1 
+        if 1 not in self.frequency_to_list:
+            self.frequency_to_list[1] = ArrayLinkedList(self.pool)
+        index = self.frequency_to_list[1].insert_at_tail((key, value))
+        self.use_counter[index] = 1
+        self.key_to_index[key] = index
+        # reset minimum frequency to 1 
+        self.min_frequency = 1
+
+    # keys of given frequency from least to most recently used 
+    def keys_with_frequency(self, frequency):
+        if self.pool is None:
+            yield from self.frequency_to_keys.get(frequency, ())
+            return
+
+        bucket = self.frequency_to_list.get(frequency)
+        index = bucket.head if bucket else -1
+        while index != -1:
+            yield self.pool.keys[index]
+            index = self.pool.next[index]
+
+    # evict least frequently used key other than protect, returns its key 
+    def evict(self, protect=None):
+        buckets = self.frequency_to_list if self.pool is not None else self.frequency_to_keys
+
+        # usual case: LRU key of minimum frequency, otherwise scan frequencies in increasing order 
+        for frequency in [self.min_frequency] + sorted(buckets):
+            for key in self.keys_with_frequency(frequency):
+                if key != protect:
+                    self.delete(key)
+                    return key
+        return None
+
+    # remove key from cache, returns True if it was present 
+    def delete(self, key):
+        if self.pool is not None:
+            if key not in self.key_to_index:
+                return False
+            index = self.key_to_index.pop(key)
+            frequency = self.use_counter[index]
+            bucket = self.frequency_to_list[frequency]
+            bucket.remove_node(index)
+            buckets = self.frequency_to_list
+            empty = not bucket.size
+        else:
+            if key not in self.key_to_value:
+                return False
+            del self.key_to_value[key]
+            frequency = self.key_to_frequency.pop(key)
+            bucket = self.frequency_to_keys[frequency]
+            del bucket[key]
+            buckets = self.frequency_to_keys
+            empty = not bucket
+
+        # removing last key of minimum frequency moves minimum to next frequency in use 
+        if empty:
+            del buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = min(buckets) if buckets else 0
+
+        self.limits.forget(key)
+        return True
+
+    # remove up to limit expired entries, returns number removed 
+    def sweep(self, limit=None):
+        if not self.limits.expiry_heap:
+            return 0
+
+        removed = 0
+        for key in self.limits.due_keys(limit):
+            removed += self.delete(key)
+        return removed
+
+'''
+statement: design a scan resistant cache, TinyLFUCache, w same get/put contract as LRUCache and LFUCache
+
+plain LRU lets one long sequential scan flush entire working set, plain LFU keeps frequency history 
+forever so keys that were hot long ago never leave, W-TinyLFU combines both:
+
+    - window: small LRUCache (about 1% of capacity) every new key enters first, absorbs bursts
+    - main: segmented LRU built from two LRUCache segments, probation (new to main) and protected 
+      (hit again while in probation), protected overflow demoted back to probation
+    - admission: when key falls out of window it competes with probation LRU victim, whichever has 
+      higher estimated frequency stays, estimates come from count min sketch below
+
+count min sketch: depth rows of small saturating counters, key hashed once per row and estimate is 
+minimum over rows, after sample_size increments every counter is halved so history ages out
+
+time O(1) per operation (depth is constant), space O(capacity)
+'''
+
+class CountMinSketch:
+    # multipliers per row, odd 64-bit constants spread hash bits across table 
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, width, depth=4, sample_size=None, max_count=15):
+        # round width up to power of 2 so row index is mask instead of modulus 
+        self.width = 1 << max(4, (max(1, width) - 1).bit_length())
+        self.mask = self.width - 1
+        self.depth = min(depth, len(self.SEEDS))
+        self.max_count = max_count
+
+        # all rows in one flat byte array, row r starts at r * width 
+        self.table = array('B', [0]) * (self.width * self.depth)
+        self.rows = [(row * self.width, seed) for row, seed in enumerate(self.SEEDS[:self.depth])]
+
+        # halve every counter after this many increments 
+        self.sample_size = sample_size or 10 * self.width
+        self.additions = 0
+
+    # slot of key in each row 
+    def indexes(self, key):
+        h = hash(key)
+        mask = self.mask
+        return [offset + (((h * seed) >> 32) & mask) for offset, seed in self.rows]
+
+    # estimated number of times key was seen since counters last aged 
+    def estimate(self, key):
+        table = self.table
+        return min([table[i] for i in self.indexes(key)])
+
+    # count one more occurrence of key, only smallest counters raised (conservative update)
+    def increment(self, key):
+        table = self.table
+        indexes = self.indexes(key)
+        current = min([table[i] for i in indexes])
+        if current < self.max_count:
+            for i in indexes:
+                if table[i] == current:
+                    table[i] = current + 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    # halve every counter so old popularity decays 
+    def age(self):
+        self.table = array('B', bytes(self.table).translate(HALVE_BYTES))
+        self.additions //= 2
+
+# lookup table mapping every byte to half its value, lets age() halve whole table in one pass 
+HALVE_BYTES = bytes(value >> 1 for value in range(256))
+
+class TinyLFUCache:
+    def __init__(self, capacity, window_percent=1, protected_percent=80):
+        self.capacity = capacity
+        self.window_capacity = max(1, capacity * window_percent // 100) if capacity else 0
+        self.main_capacity = capacity - self.window_capacity
+        self.protected_capacity = self.main_capacity * protected_percent // 100
+
+        # every segment is a plain LRUCache, capacities set so they never evict on their own 
+        self.window = LRUCache(self.window_capacity)
+        self.probation = LRUCache(self.main_capacity)
+        self.protected = LRUCache(self.protected_capacity)
+        self.sketch = CountMinSketch(capacity)
+
+    # number of keys currently cached 
+    def __len__(self):
+        return len(self.window.cache_map) + len(self.probation.cache_map) + len(self.protected.cache_map)
+
+    # least recently used (key, value) of segment without touching its order 
+    def lru_entry(self, segment):
+        node = segment.cache_list.get_tail()
+        return segment.cache_list.get_key(node), segment.cache_list.get_value(node)
+
+    # move key hit in probation into protected, demote protected LRU entry if protected full 
+    def promote(self, key, value):
+        self.probation.delete(key)
+        if not self.protected_capacity:
+            self.probation.set(key, value)
+            return
+
+        if len(self.protected.cache_map) == self.protected_capacity:
+            demoted_key, demoted_value = self.lru_entry(self.protected)
+            self.protected.evict()
+            self.probation.set(demoted_key, demoted_value)
+        self.protected.set(key, value)
+
+    # candidate pushed out of window enters main if main has room or it beats main's victim 
+    def admit(self, key, value):
+        if not self.main_capacity:
+            return
+
+        if len(self.probation.cache_map) + len(self.protected.cache_map) < self.main_capacity:
+            self.probation.set(key, value)
+            return
+
+        # victim is probation LRU entry, protected LRU entry only when probation empty 
+        victim_segment = self.probation if self.probation.cache_map else self.protected
+        victim_key, _ = self.lru_entry(victim_segment)
+
+        if self.sketch.estimate(key) > self.sketch.estimate(victim_key):
+            victim_segment.evict()
+            self.probation.set(key, value)
+
+    # returns value of key or -1 if key does not exist 
+    def get(self, key):
+        self.sketch.increment(key)
+
+        if key in self.window.cache_map:
+            return self.window.get(key)
+
+        if key in self.protected.cache_map:
+            return self.protected.get(key)
+
+        if key in self.probation.cache_map:
+            value = self.probation.get(key)
+            self.promote(key, value)
+            return value
+
+        return -1
+
+    # adds new key/value pair or updates existing key 
+    def put(self, key, value):
+        if not self.capacity:
+            return
+        self.sketch.increment(key)
+
+        if key in self.window.cache_map:
+            self.window.set(key, value)
+        elif key in self.protected.cache_map:
+            self.protected.set(key, value)
+        elif key in self.probation.cache_map:
+            self.promote(key, value)
+        else:
+            # make room in window, its LRU entry becomes admission candidate for main 
+            if len(self.window.cache_map) == self.window_capacity:
+                candidate_key, candidate_value = self.lru_entry(self.window)
+                self.window.evict()
+                self.admit(candidate_key, candidate_value)
+            self.window.set(key, value)
+
+    set = put
+
+# replay trace of keys against cache, each miss loads key, returns hit rate 
+def replay_trace(cache, trace):
+    store = cache.set if hasattr(cache, 'set') else cache.put
+    hits = 0
+    for key in trace:
+        if cache.get(key) != -1:
+            hits += 1
+        else:
+            store(key, True)
+    return hits / len(trace) if trace else 0.0
+
+# zipf distributed hot keys w long sequential scans mixed in, hot set moves every shift_every 
+# accesses so stale popularity stops paying off, same seed gives same trace 
+def scan_hot_trace(length=200000, hot_keys=5000, skew=1.0, scan_every=20000, scan_length=5000,
+                   shift_every=50000, seed=7):
+    generator = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, hot_keys + 1)]
+    hot = generator.choices(range(hot_keys), weights=weights, k=length)
+
+    trace = []
+    next_scan_key = -1
+    for i, key in enumerate(hot):
+        # scan touches keys never seen before and never seen again, negative so they never collide w hot keys 
+        if i and i % scan_every == 0:
+            trace.extend(range(next_scan_key, next_scan_key - scan_length, -1))
+            next_scan_key -= scan_length
+        trace.append(key + (i // shift_every) * hot_keys)
+    return trace
+
+# compare hit rate and replay time of LRU, LFU and TinyLFU on same trace 
+def benchmark_cache_policies(capacity=1000, trace=None):
+    trace = trace if trace is not None else scan_hot_trace()
+    policies = [
+        ('LRUCache', lambda: LRUCache(capacity)),
+        ('LFUCache', lambda: LFUCache(capacity)),
+        ('TinyLFUCache', lambda: TinyLFUCache(capacity)),
+    ]
+
+    results = {}
+    for name, make in policies:
+        start = time.perf_counter()
+        hit_rate = replay_trace(make(), trace)
+        results[name] = (hit_rate, time.perf_counter() - start)
+        print(f"{name:<14} capacity {capacity}\thit rate {hit_rate:.4f}\t{results[name][1]:.2f}s")
+    return results
@@ -84,8 +84,9 @@ class DesignHashMap():
     def __init__(self):
         # choose prime number for key space size (preferably large one)
         self.key_space = 2069 
-        # create array and initialize it with empty buckets equal to key space size 
-        self.bucket = [Bucket()] * self.key_space
+        # create array and initialize it with empty buckets equal to key space size, one Bucket 
+        # object per slot ([Bucket()] * n would share one bucket between every slot)
+        self.bucket = [Bucket() for _ in range(self.key_space)]
         
     # implement supporting functions     
     # function to add key/value pair to hash map 
@@ -104,6 +105,171 @@ class DesignHashMap():
         hash_key = key % self.key_space
         self.bucket[hash_key].remove(key)
 
+'''
+resizable hash map: same put/get/remove contract as DesignHashMap (get returns -1 for missing key) 
+but no buckets, keys and values sit in flat parallel arrays and collisions resolved by linear 
+probing (open addressing)
+
+- table size power of 2, key's home slot from Fibonacci hashing so sequential keys still spread 
+- grows 2x when size passes max_load * capacity, so probes stay short as map fills 
+- remove uses backward shift: following entries of same probe run slide back into freed slot, so 
+  no tombstones and probe lengths stay those of a map that never saw the removed key 
+- probe_stats() reports how many slots lookups of stored keys touch (1 = found at home slot)
+
+keys must fit in signed 64-bit integer
+
+time O(1) average per operation, space O(n)
+'''
+from array import array
+import random
+import time
+
+class ResizableHashMap:
+    def __init__(self, capacity=8, max_load=0.7):
+        self.max_load = max_load
+        self.size = 0
+        self.allocate(max(8, 1 << (capacity - 1).bit_length()))
+
+    # fresh empty table w given power of 2 number of slots 
+    def allocate(self, capacity):
+        self.capacity = capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.keys = array('q', [0]) * capacity
+        self.used = array('B', [0]) * capacity
+        self.values = [None] * capacity
+
+    # home slot of key 
+    def hash(self, key):
+        return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    # slot holding key, or empty slot where it would go 
+    def probe(self, key):
+        keys, used, mask = self.keys, self.used, self.capacity - 1
+        index = self.hash(key)
+        while used[index] and keys[index] != key:
+            index = (index + 1) & mask
+        return index
+
+    # rebuild table w twice as many slots 
+    def grow(self):
+        old_keys, old_used, old_values = self.keys, self.used, self.values
+        self.allocate(self.capacity * 2)
+        for key, used, value in zip(old_keys, old_used, old_values):
+            if used:
+                index = self.probe(key)
+                self.keys[index], self.used[index], self.values[index] = key, 1, value
+
+    # add key/value pair or update value of existing key 
+    def put(self, key, value):
+        index = self.probe(key)
+        if self.used[index]:
+            self.values[index] = value
+            return
+
+        self.keys[index], self.used[index], self.values[index] = key, 1, value
+        self.size += 1
+        if self.size > self.capacity * self.max_load:
+            self.grow()
+
+    # value of key or -1 if key not stored 
+    def get(self, key):
+        index = self.probe(key)
+        return self.values[index] if self.used[index] else -1
+
+    # remove key/value pair if key stored 
+    def remove(self, key):
+        index = self.probe(key)
+        if not self.used[index]:
+            return
+
+        keys, used, values, mask = self.keys, self.used, self.values, self.capacity - 1
+        self.size -= 1
+
+        # backward shift: walk rest of run, move back any entry whose home is not between hole and it 
+        hole = index
+        index = (index + 1) & mask
+        while used[index]:
+            home = self.hash(keys[index])
+            if (index - home) & mask >= (index - hole) & mask:
+                keys[hole], values[hole] = keys[index], values[index]
+                hole = index
+            index = (index + 1) & mask
+
+        used[hole] = 0
+        values[hole] = None
+
+    # put every (key, value) pair 
+    def put_many(self, pairs):
+        for key, value in pairs:
+            self.put(key, value)
+
+    # get for every key 
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def __len__(self):
+        return self.size
+
+    # slots touched by successful lookup of each stored key, averaged and worst case 
+    def probe_stats(self):
+        mask = self.capacity - 1
+        lengths = [((index - self.hash(key)) & mask) + 1
+                   for index, (key, used) in enumerate(zip(self.keys, self.used)) if used]
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'load_factor': self.size / self.capacity,
+            'mean_probe': sum(lengths) / len(lengths) if lengths else 0.0,
+            'max_probe': max(lengths, default=0),
+        }
+
+# time put, get and remove of n keys for DesignHashMap, ResizableHashMap and built in dict 
+def benchmark_hash_maps(n=100000, seed=7):
+    generator = random.Random(seed)
+    workloads = [
+        ('sequential', list(range(n))),
+        ('random', [generator.randrange(-2 ** 40, 2 ** 40) for _ in range(n)]),
+    ]
+
+    # dict w DesignHashMap method names 
+    class BuiltinMap(dict):
+        put = dict.__setitem__
+        def get(self, key):
+            return dict.get(self, key, -1)
+        def remove(self, key):
+            self.pop(key, None)
+
+    results = {}
+    for workload, keys in workloads:
+        for name, make in [('DesignHashMap', DesignHashMap), ('ResizableHashMap', ResizableHashMap),
+                           ('dict', BuiltinMap)]:
+            hash_map = make()
+            timings = []
+
+            start = time.perf_counter()
+            for key in keys:
+                hash_map.put(key, key)
+            timings.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for key in keys:
+                hash_map.get(key)
+            timings.append(time.perf_counter() - start)
+
+            stats = hash_map.probe_stats() if isinstance(hash_map, ResizableHashMap) else None
+
+            start = time.perf_counter()
+            for key in keys:
+                hash_map.remove(key)
+            timings.append(time.perf_counter() - start)
+
+            results[(workload, name)] = timings
+            line = f"{workload:<11}{name:<18}put {timings[0]:.3f}s\tget {timings[1]:.3f}s\tremove {timings[2]:.3f}s"
+            if stats:
+                line += f"\tmean probe {stats['mean_probe']:.2f}, max probe {stats['max_probe']}"
+            print(line)
+    return results
+
 # given numerator and denominator, return fraction in string format, time and space O(pd), pd = lowest denominator
 def fraction_to_decimal(numerator, denominator):
     # declare result variable to store result in form of string 
@@ -263,6 +429,141 @@ class RequestLogger:
         else: # if repeat request arrives before time limit expires, reject it 
             return False
 
+'''
+bounded request logger: RequestLogger keeps every message it ever accepted, here accepted messages 
+are forgotten once time limit has passed for them, so memory tracks messages accepted within last 
+(ceil(limit / bucket_width) + 1) x bucket_width seconds only 
+
+- accepted: one dict message -> timestamp it was accepted at, decision is single lookup, matches 
+  RequestLogger exactly instead of being rounded to bucket boundaries 
+- ring of time buckets only drives forgetting: bucket covers bucket_width seconds, records messages 
+  accepted during it, ring holds just enough buckets to span time limit, when time moves into slot its 
+  old bucket's messages dropped from accepted unless accepted again since 
+- timestamps expected in non decreasing order, late one recorded in current bucket so only forgotten later 
+
+- message_request_decision_many(timestamps, messages): decisions for whole batch in order 
+- ShardedRequestLogger: splits batch by message hash across worker processes, each worker owns 
+  BucketedRequestLogger for its share of messages, since decision for message depends only on 
+  earlier requests for same message, sharded decisions equal single logger ones 
+
+time O(1) amortized per request (each bucket cleared once), space O(messages accepted in window)
+'''
+from math import ceil
+from multiprocessing import Pipe, Process
+
+class BucketedRequestLogger:
+    def __init__(self, time_limit, bucket_width=None):
+        self.limit = time_limit
+        self.width = bucket_width or time_limit
+        self.num_buckets = ceil(time_limit / self.width) + 1
+        self.accepted = {} # message -> accepted timestamp 
+        self.buckets = [{} for _ in range(self.num_buckets)] # message -> timestamp accepted during bucket 
+        self.current = None # latest bucket number seen 
+
+    # move ring forward to bucket of timestamp, every slot time moves into forgets its old bucket, 
+    # returns slot to record in 
+    def rotate(self, timestamp):
+        bucket = int(timestamp // self.width)
+        if self.current is None:
+            self.current = bucket
+        elif bucket > self.current:
+            # jump longer than ring clears whole ring once 
+            for passed in range(max(self.current + 1, bucket - self.num_buckets + 1), bucket + 1):
+                self.expire(passed % self.num_buckets)
+            self.current = bucket
+        return self.current % self.num_buckets
+
+    # drop messages of slot's bucket from accepted, skip ones accepted again later 
+    def expire(self, slot):
+        accepted = self.accepted
+        for message, timestamp in self.buckets[slot].items():
+            if accepted.get(message) == timestamp:
+                del accepted[message]
+        self.buckets[slot] = {}
+
+    # True if request should be displayed, False if same message accepted within time limit 
+    def message_request_decision(self, timestamp, request):
+        slot = self.rotate(timestamp)
+        accepted = self.accepted.get(request)
+        if accepted is not None and timestamp - accepted < self.limit:
+            return False
+
+        self.accepted[request] = timestamp
+        self.buckets[slot][request] = timestamp
+        return True
+
+    # decisions for batch of requests in order 
+    def message_request_decision_many(self, timestamps, messages):
+        decide = self.message_request_decision
+        return [decide(timestamp, message) for timestamp, message in zip(timestamps, messages)]
+
+    # number of messages currently remembered 
+    def __len__(self):
+        return len(self.accepted)
+
+# worker process loop: answer batches for its shard until it receives None 
+def request_logger_worker(connection, time_limit, bucket_width):
+    logger = BucketedRequestLogger(time_limit, bucket_width)
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        connection.send(logger.message_request_decision_many(*batch))
+    connection.close()
+
+class ShardedRequestLogger:
+    def __init__(self, time_limit, workers=4, bucket_width=None):
+        self.workers = workers
+        self.connections = []
+        self.processes = []
+        for _ in range(workers):
+            parent, child = Pipe()
+            process = Process(target=request_logger_worker, args=(child, time_limit, bucket_width), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    # split batch by message hash, every worker decides its share in parallel, answers put back in order 
+    def message_request_decision_many(self, timestamps, messages):
+        positions = [[] for _ in range(self.workers)]
+        shard_timestamps = [[] for _ in range(self.workers)]
+        shard_messages = [[] for _ in range(self.workers)]
+        for position, (timestamp, message) in enumerate(zip(timestamps, messages)):
+            shard = hash(message) % self.workers
+            positions[shard].append(position)
+            shard_timestamps[shard].append(timestamp)
+            shard_messages[shard].append(message)
+
+        # send every shard before waiting on any so workers run concurrently 
+        for shard, connection in enumerate(self.connections):
+            connection.send((shard_timestamps[shard], shard_messages[shard]))
+
+        decisions = [False] * len(messages)
+        for shard, connection in enumerate(self.connections):
+            for position, decision in zip(positions[shard], connection.recv()):
+                decisions[position] = decision
+        return decisions
+
+    # single request version, goes through batch path 
+    def message_request_decision(self, timestamp, request):
+        return self.message_request_decision_many([timestamp], [request])[0]
+
+    # stop worker processes 
+    def close(self):
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections, self.processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 '''
 statement: given 2 distinct arrays, nums1 and nums2, where nums1 is a subset of nums2
 find all greater elements for nums1 values in corresponding places of nums2, find next 
@@ -400,6 +701,87 @@ def find_duplicate(paths):
             
     return result
 
+'''
+statement: same output as find_duplicate (list of groups of 2+ paths w identical content), but for real files on 
+disk given as iterator of file paths or as directory to walk, w/ out ever holding file contents in memory 
+
+- filter in stages, each stage only looks at files that collided in previous one: 
+    1. group by size from os.stat, files w unique size can't have duplicate, no reads at all 
+    2. hash first prefix_size bytes, most different files w same size differ early 
+    3. hash whole file streamed in chunk_size pieces into one reused buffer 
+- files not bigger than prefix_size already fully hashed in stage 2, skip stage 3 
+- hashing runs in thread pool, hashlib releases GIL on big buffers and reads block on disk, so threads overlap 
+- files that vanish or can't be read between stages skipped 
+
+time O(total bytes of files sharing size w another file), space O(number of files + workers x chunk_size) 
+'''
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# every regular file under root, symlinks not followed 
+def walk_files(root):
+    for directory, _, file_names in os.walk(root):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            if os.path.isfile(path) and not os.path.islink(path):
+                yield path
+
+def hash_file(path, limit=None, chunk_size=1 << 16):
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    remaining = limit
+    try:
+        with open(path, 'rb', buffering=0) as file:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                read = file.readinto(view[:size])
+                if not read:
+                    break
+                digest.update(view[:read])
+                if remaining is not None:
+                    remaining -= read
+    except OSError:
+        return path, None
+    return path, digest.digest()
+
+# regroup every (size, paths) group by hash of its files, drop groups left w single file, every file of every 
+# group submitted up front so all workers stay busy even when groups only hold 2 or 3 files 
+def split_by_hash(executor, groups, limit, chunk_size):
+    jobs = [(index, path) for index, (_, paths) in enumerate(groups) for path in paths]
+    hashes = executor.map(lambda job: (job[0], hash_file(job[1], limit, chunk_size)), jobs)
+
+    by_hash = defaultdict(list)
+    for index, (path, digest) in hashes:
+        if digest is not None:
+            by_hash[(index, digest)].append(path)
+    return [(groups[index][0], paths) for (index, _), paths in by_hash.items() if len(paths) > 1]
+
+def find_duplicate_files(paths=None, root=None, prefix_size=4096, chunk_size=1 << 16, workers=4):
+    if paths is None:
+        paths = walk_files(root)
+
+    # stage 1: size 
+    by_size = defaultdict(list)
+    for path in paths:
+        try:
+            by_size[os.stat(path).st_size].append(path)
+        except OSError:
+            continue
+    groups = [(size, group) for size, group in by_size.items() if len(group) > 1]
+    del by_size
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # stage 2: prefix hash, for small files prefix is whole file so their groups final 
+        groups = split_by_hash(executor, groups, prefix_size, chunk_size)
+        result = [paths for size, paths in groups if size <= prefix_size]
+        large = [(size, paths) for size, paths in groups if size > prefix_size]
+
+        # stage 3: full streaming hash only for files whose prefix collided 
+        result.extend(paths for _, paths in split_by_hash(executor, large, None, chunk_size))
+    return result
+
 # create class that calculates dot product of two given sparse vectors, space O(l)
 class SparseVector:
     # time O(n)
@@ -426,6 +808,129 @@ class SparseVector:
         # return sum obtained from dot product calculation
         return sum
 
+'''
+columnar sparse vector: same constructor and dot_product as SparseVector, but non zero entries kept 
+as two parallel columns, sorted array('l') of indexes and array('d') of values, instead of dict
+
+- dot_product: indexes of both vectors sorted, so two pointer merge finds common indexes in 
+  O(l1 + l2), when one vector gallop_ratio times longer, each index of short one binary searched in 
+  long one from previous hit onwards, O(l1 log l2)
+- SparseMatrix: many vectors stacked row by row in compressed sparse row layout (indptr, indices, 
+  data), plus column postings (rows and values per column) built once, dot_many(query) walks only 
+  postings of query's non zero columns to score every row in one pass
+- NumPy: opt in w use_numpy=True (ignored when numpy not importable), dot_many multiplies whole data column by 
+  dense copy of query and sums products per row w bincount, no Python loop per entry 
+
+time: dot_product O(min(l1 + l2, l1 log l2)), dot_many O(sum of posting lengths of query columns)
+space O(non zero entries)
+'''
+from bisect import bisect_left
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class ColumnarSparseVector:
+    def __init__(self, nums=(), indices=None, values=None):
+        if indices is not None:
+            # already sparse input, sorted by index 
+            order = sorted(range(len(indices)), key=indices.__getitem__)
+            self.indices = array('l', (indices[i] for i in order))
+            self.values = array('d', (values[i] for i in order))
+        else:
+            self.indices = array('l', (i for i, n in enumerate(nums) if n != 0))
+            self.values = array('d', (nums[i] for i in self.indices))
+
+    def __len__(self):
+        return len(self.indices)
+
+    def dot_product(self, vec, gallop_ratio=8):
+        short, long = (self, vec) if len(self) <= len(vec) else (vec, self)
+        if not len(short):
+            return 0.0
+        if len(long) >= gallop_ratio * len(short):
+            return self.gallop(short, long)
+
+        # two pointer merge over sorted indexes 
+        total = 0.0
+        i = j = 0
+        indices1, values1, indices2, values2 = self.indices, self.values, vec.indices, vec.values
+        while i < len(indices1) and j < len(indices2):
+            if indices1[i] == indices2[j]:
+                total += values1[i] * values2[j]
+                i += 1
+                j += 1
+            elif indices1[i] < indices2[j]:
+                i += 1
+            else:
+                j += 1
+        return total
+
+    # binary search each index of short vector in long one, search start only moves right 
+    def gallop(self, short, long):
+        total = 0.0
+        low = 0
+        for index, value in zip(short.indices, short.values):
+            low = bisect_left(long.indices, index, low)
+            if low == len(long.indices):
+                break
+            if long.indices[low] == index:
+                total += value * long.values[low]
+        return total
+
+class SparseMatrix:
+    def __init__(self, vectors, use_numpy=False):
+        # compressed sparse row layout: row r owns entries indptr[r] .. indptr[r + 1] - 1 
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        self.data = array('d')
+        for vector in vectors:
+            self.indices.extend(vector.indices)
+            self.data.extend(vector.values)
+            self.indptr.append(len(self.indices))
+        self.rows = len(self.indptr) - 1
+        self.dimension = max(self.indices) + 1 if self.indices else 0
+
+        # column postings: for every column, rows that have it and their values 
+        self.postings = defaultdict(lambda: (array('l'), array('d')))
+        for row in range(self.rows):
+            for k in range(self.indptr[row], self.indptr[row + 1]):
+                rows, values = self.postings[self.indices[k]]
+                rows.append(row)
+                values.append(self.data[k])
+        self.postings.default_factory = None
+
+        self.use_numpy = use_numpy and numpy is not None
+        if self.use_numpy:
+            self.numpy_indices = numpy.asarray(self.indices, dtype=numpy.int64)
+            self.numpy_data = numpy.asarray(self.data, dtype=numpy.float64)
+            # row of every stored entry, lets bincount sum products per row 
+            self.numpy_rows = numpy.repeat(numpy.arange(self.rows), numpy.diff(numpy.asarray(self.indptr)))
+
+    # dot product of query w every row, in row order 
+    def dot_many(self, query):
+        if self.use_numpy:
+            return self.numpy_dot_many(query)
+
+        scores = [0.0] * self.rows
+        for column, value in zip(query.indices, query.values):
+            if column in self.postings:
+                rows, values = self.postings[column]
+                for row, entry in zip(rows, values):
+                    scores[row] += entry * value
+        return scores
+
+    def numpy_dot_many(self, query):
+        dense_query = numpy.zeros(self.dimension)
+        query_indices = numpy.asarray(query.indices, dtype=numpy.int64)
+        query_values = numpy.asarray(query.values, dtype=numpy.float64)
+        inside = query_indices < self.dimension
+        dense_query[query_indices[inside]] = query_values[inside]
+
+        products = self.numpy_data * dense_query[self.numpy_indices]
+        return numpy.bincount(self.numpy_rows, weights=products, minlength=self.rows).tolist()
+
 '''
 statement: given list of scores for multiple students as items where items[i] = [ID, score]
 indicates student ID and score -> compute top 5 average scores for each student, return result 
@@ -469,6 +974,87 @@ def high_five(items):
     # return final result list with each student's ID and their calculated average of top 5 scores 
     return result
 
+'''
+top k per key: incremental version of high_five for endless stream of (id, score) events, w/ out keeping 
+every score per id and w/ out scanning range(1, max_id + 1)
+
+- min heap of size k per key, root smallest of current top k, new score only enters if it beats root 
+  (heapreplace swaps root out in one sift) so each heap never holds more than k scores 
+- running sum of each heap updated on every change, average(key) = sum // k O(1), same as high_five 
+- merge(other): combine shards built on separate streams, pushes other shard's top k into this one, 
+  top k of union always inside union of top ks 
+
+time: push O(log k), push_many O(n log k), average O(1), merge O(keys x k log k)
+space O(keys x k)
+'''
+from heapq import heappush, heapreplace
+
+class TopKPerKey:
+    def __init__(self, k=5):
+        self.k = k
+        self.heaps = {}
+        self.sums = {}
+
+    def __len__(self):
+        return len(self.heaps)
+
+    def __contains__(self, key):
+        return key in self.heaps
+
+    def push(self, key, score):
+        heap = self.heaps.get(key)
+        if heap is None:
+            self.heaps[key] = [score]
+            self.sums[key] = score
+        elif len(heap) < self.k:
+            heappush(heap, score)
+            self.sums[key] += score
+        elif score > heap[0]:
+            self.sums[key] += score - heapreplace(heap, score)
+
+    # batch ingestion, lookups bound to locals since this is hot loop over billions of events 
+    def push_many(self, items):
+        k, heaps, sums = self.k, self.heaps, self.sums
+        for key, score in items:
+            heap = heaps.get(key)
+            if heap is None:
+                heaps[key] = [score]
+                sums[key] = score
+            elif len(heap) < k:
+                heappush(heap, score)
+                sums[key] += score
+            elif score > heap[0]:
+                sums[key] += score - heapreplace(heap, score)
+
+    def top_k(self, key):
+        return sorted(self.heaps.get(key, ()), reverse=True)
+
+    def total(self, key):
+        return self.sums.get(key, 0)
+
+    # integer average of top k scores divided by k like high_five, so key w fewer than k scores 
+    # counts missing ones as 0 
+    def average(self, key):
+        if key not in self.sums:
+            return None
+        return self.sums[key] // self.k
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError("cannot merge TopKPerKey with different k")
+        self.push_many((key, score) for key, heap in other.heaps.items() for score in heap)
+        return self
+
+    # [[key, average]] sorted by key 
+    def averages(self):
+        return [[key, self.sums[key] // self.k] for key in sorted(self.sums)]
+
+# high_five on TopKPerKey, time O(n log 5 + m log m) where m = number of distinct ids, space O(m)
+def high_five_top_k(items):
+    top_scores = TopKPerKey(5)
+    top_scores.push_many(items)
+    return top_scores.averages()
+
 # find longest palindrome in given string, time and space O(n)
 def longest_palindrome(s):
     frequencies = {}
@@ -229,9 +229,10 @@ class Trie3:
         
         return word
 # time O(m + n) where m = number of characters of all prefixes in dictionary, n = number sentence words, space O(m)
-def replace_words(sentence, dictionary):
+# trie_class: any trie w insert and replace, e.g. RadixTrie for long shared prefixes 
+def replace_words(sentence, dictionary, trie_class=Trie3):
     # create trie to store each prefix present in dictionary 
-    trie = Trie3()
+    trie = trie_class()
     
     # iterate over prefixes in dictionary and insert into trie
     for prefix in dictionary:
@@ -349,8 +350,115 @@ class WordDictionary:
                 current_node.complete = True         
         print("\tWord added successfully!")
         
-    # function to search for word in dictionary, time and space O(1)
+    # silent bulk add, returns number of words not already present, time O(total characters)
+    def add_words(self, words):
+        added = 0
+        for word in words:
+            # empty word never stored, same as add_word 
+            if not word:
+                continue
+            node = self.root
+            for value in word:
+                index = ord(value) - ord('a')
+                if node.children[index] is None:
+                    node.children[index] = TrieNode4()
+                node = node.children[index]
+            if not node.complete:
+                node.complete = True
+                added += 1
+        return added
+
+    # function to search for word in dictionary, reentrant (no shared state), so safe from many threads 
     def search_word(self, word):
+        return self.match(word)
+
+    # frontier matcher: pattern consumed one token at a time, frontier = every trie node that matches 
+    # pattern so far, no recursion and no shared flag
+    # - letter: child on that letter, '.': every non empty child, '[abc]' / '[a-z]' / '[^ab]': non empty 
+    #   children in class, '*': any run of letters (even none), frontier grows to whole subtrees 
+    # - empty frontier ends search early, nodes reachable by 2 routes after '*' kept once 
+    # time O(nodes visited), at most O(m x n) for m tokens and n trie nodes, space O(n)
+    def match(self, pattern):
+        tokens = self.parse_pattern(pattern)
+        frontier = [self.root]
+        for position, token in enumerate(tokens):
+            if token == '*':
+                # trailing star: no deletes, so every node but root has word at or below it 
+                if position == len(tokens) - 1:
+                    return any(node is not self.root or node.complete or any(node.children) for node in frontier)
+                frontier = self.descendants(frontier)
+                continue
+
+            next_frontier = []
+            for node in frontier:
+                if token is None:
+                    next_frontier.extend(child for child in node.children if child is not None)
+                elif isinstance(token, int):
+                    child = node.children[token] if 0 <= token < 26 else None
+                    if child is not None:
+                        next_frontier.append(child)
+                else:
+                    next_frontier.extend(node.children[index] for index in token if node.children[index] is not None)
+            if not next_frontier:
+                return False
+            frontier = next_frontier
+        return any(node.complete for node in frontier)
+
+    # frontier nodes and everything below them, each node once 
+    def descendants(self, frontier):
+        seen = {id(node) for node in frontier}
+        result = list(frontier)
+        stack = list(frontier)
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                if child is not None and id(child) not in seen:
+                    seen.add(id(child))
+                    result.append(child)
+                    stack.append(child)
+        return result
+
+    # tokens: child index for letter, None for '.', '*', tuple of child indexes for character class, 
+    # runs of '*' collapsed 
+    def parse_pattern(self, pattern):
+        tokens = []
+        i = 0
+        while i < len(pattern):
+            character = pattern[i]
+            if character == '.':
+                tokens.append(None)
+            elif character == '*':
+                if not tokens or tokens[-1] != '*':
+                    tokens.append('*')
+            elif character == '[':
+                end = pattern.find(']', i + 2)
+                if end == -1:
+                    raise ValueError(f"unterminated character class in {pattern!r}")
+                body = pattern[i + 1:end]
+                negate = body[0] in '^!'
+                if negate:
+                    body = body[1:]
+                letters = set()
+                j = 0
+                while j < len(body):
+                    if j + 2 < len(body) and body[j + 1] == '-':
+                        letters.update(chr(c) for c in range(ord(body[j]), ord(body[j + 2]) + 1))
+                        j += 3
+                    else:
+                        letters.add(body[j])
+                        j += 1
+                indexes = {ord(letter) - ord('a') for letter in letters} & set(range(26))
+                if negate:
+                    indexes = set(range(26)) - indexes
+                tokens.append(tuple(sorted(indexes)))
+                i = end
+            else:
+                tokens.append(ord(character) - ord('a'))
+            i += 1
+        return tokens
+
+    # original recursive search, reports through shared can_find flag so not reentrant 
+    def recursive_search_word(self, word):
         # set can_find variable as False 
         self.can_find = False
         
@@ -522,6 +630,100 @@ def print_grid(grid):
     for i in grid:
         output = '   '.join(i)
         print("\t", output)
+
+'''
+parallel find_strings: starting cells split into chunks searched by ProcessPoolExecutor workers, results 
+merged and deduplicated, for large grids and big dictionaries 
+
+- grid never mutated, each path carries private visited bitmask (bit r x columns + c), so any number of 
+  searches can share one grid 
+- iterative DFS w explicit stack of (row, column, trie node, visited, word), long words can't hit 
+  recursion limit 
+- every worker builds own Trie5 once (pool initializer), found words unmarked and dead branches pruned in 
+  that private copy only 
+- workers=1 runs same search in process w/ out pool 
+- result in order of words, each found word once 
+
+time O(n x 3^l) like find_strings, split over workers, space O(m) trie per worker + O(l) stack entries per 
+level of DFS, each w O(n / 64) word bitmask
+'''
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# state of current pool worker, set once by initializer 
+worker_grid = None
+worker_trie = None
+
+def init_grid_worker(grid, words):
+    global worker_grid, worker_trie
+    worker_grid = grid
+    worker_trie = Trie5()
+    for word in words:
+        worker_trie.insert(word)
+
+def search_cells_worker(cells):
+    return search_cells(worker_grid, worker_trie, cells)
+
+# unmark found word and cut nodes left w/ out children or word, safe for words that prefix other words 
+def prune_found(trie, word):
+    path = [trie.root]
+    for character in word:
+        path.append(path[-1].children[character])
+    path[-1].is_string = False
+    for i in range(len(word), 0, -1):
+        node = path[i]
+        if node.children or node.is_string:
+            break
+        del path[i - 1].children[word[i - 1]]
+
+def search_cells(grid, trie, cells):
+    rows, columns = len(grid), len(grid[0])
+    found = []
+    for row, column in cells:
+        node = trie.root.children.get(grid[row][column])
+        if node is None:
+            continue
+        stack = [(row, column, node, 1 << (row * columns + column), grid[row][column])]
+        while stack:
+            row, column, node, visited, word = stack.pop()
+            if node.is_string:
+                found.append(word)
+                prune_found(trie, word)
+            for row_offset, column_offset in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                next_row, next_column = row + row_offset, column + column_offset
+                if 0 <= next_row < rows and 0 <= next_column < columns:
+                    bit = 1 << (next_row * columns + next_column)
+                    if not visited & bit:
+                        child = node.children.get(grid[next_row][next_column])
+                        if child is not None:
+                            stack.append((next_row, next_column, child, visited | bit, word + grid[next_row][next_column]))
+    return found
+
+def find_strings_parallel(grid, words, workers=None, chunks_per_worker=4):
+    if not grid or not grid[0]:
+        return []
+    cells = [(row, column) for row in range(len(grid)) for column in range(len(grid[0]))]
+
+    if workers == 1:
+        trie = Trie5()
+        for word in words:
+            trie.insert(word)
+        found = set(search_cells(grid, trie, cells))
+    else:
+        workers = workers or os.cpu_count() or 1
+        size = max(1, len(cells) // (workers * chunks_per_worker))
+        chunks = [cells[i:i + size] for i in range(0, len(cells), size)]
+        found = set()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_grid_worker, initargs=(grid, words)) as executor:
+            for words_found in executor.map(search_cells_worker, chunks):
+                found.update(words_found)
+
+    result = []
+    for word in words:
+        if word in found:
+            result.append(word)
+            found.discard(word)
+    return result
         
 '''
 prompt: given list of strings "words" and integer "k" -> return k most frequently occurring strings,
@@ -596,6 +798,14 @@ def top_k_frequent_words(words, k):
 
 # given int n, create function that returns all numbers in range 1 to n in lexicographical order
 def lexicographical_order(n):
+    # insert numbers from 1 to n into compact trie as digit strings, each digit saved as trie node 
+    trie = CompactTrie(str(i) for i in range(1, n + 1))
+
+    # prefix enumeration walks children in digit order (preorder), iterative so no recursion per digit 
+    return [int(number) for number in trie.words_with_prefix('')]
+
+# original version on Trie5 w recursive preorder traversal 
+def recursive_lexicographical_order(n):
     result = []
     
     # insert numbers from 1 to n into trie, each number split into digits by trie and saved as trie nodes
@@ -615,4 +825,696 @@ def lex_traversal(node, prefix, result):
         result.append(int(prefix))
     
     for digit in sorted(node.children.keys()):
-        lex_traversal(node.children[digit], prefix + digit, result)
\ No newline at end of file
+        lex_traversal(node.children[digit], prefix + digit, result)
+
+'''
+compact trie engine: one trie (insert, search, starts_with, prefix enumeration, delete) over pluggable 
+node layout, replaces per problem copies TrieNode1/2/3/5 (dict per node) and TrieNode4/TrieNode (26 slot 
+list per node even when nearly empty) for tries w tens of millions of nodes 
+
+layouts, both expose same small set of node operations, trie engine only talks to those:
+- 'slots': SlotTrieNode w __slots__, children dict only created once node gets first child, 
+  so leaves (most nodes in big trie) carry no dict at all 
+- 'double_array': whole trie in flat array('i') columns, node = index, no Python object per node
+    - child of node s on character code c lives at t = base[s] + c, valid only if check[t] == s 
+    - adding child whose slot already taken by other node: relocate all children of s to new base where 
+      every slot free, grandchildren's check moved w them 
+    - degree[s] counts children, makes has children O(1) and tells when base not assigned yet 
+    - free slots chained in circular linked list kept inside their own base / check, base search walks 
+      only free slots 
+    - characters mapped to codes 1, 2, ... in order first seen, so any alphabet works 
+    - few times less memory than slots but slower inserts (relocations), best for build once, read many 
+
+time: insert, search, starts_with, delete O(l) hops where l = length of word (double array insert may relocate 
+siblings, O(alphabet) each), words_with_prefix O(p + size of subtree)
+space: slots O(nodes) objects, double array 4 columns x O(slots) machine ints 
+'''
+from array import array
+
+class SlotTrieNode:
+    __slots__ = ('children', 'is_word')
+
+    def __init__(self):
+        self.children = None
+        self.is_word = False
+
+class SlotLayout:
+    def __init__(self):
+        self.root = SlotTrieNode()
+
+    def child(self, node, character):
+        children = node.children
+        return children.get(character) if children else None
+
+    def add_child(self, node, character):
+        if node.children is None:
+            node.children = {}
+        child = node.children.get(character)
+        if child is None:
+            child = node.children[character] = SlotTrieNode()
+        return child
+
+    def remove_child(self, node, character):
+        del node.children[character]
+        if not node.children:
+            node.children = None
+
+    def has_children(self, node):
+        return node.children is not None
+
+    # (character, child) pairs in lexicographic order 
+    def children(self, node):
+        return sorted(node.children.items()) if node.children else []
+
+    def is_word(self, node):
+        return node.is_word
+
+    def set_word(self, node, is_word):
+        node.is_word = is_word
+
+class DoubleArrayLayout:
+    def __init__(self, size=1024):
+        self.base = array('i', [0]) * size
+        self.check = array('i', [0]) * size
+        self.word = array('b', [0]) * size
+        self.degree = array('i', [0]) * size
+        # root at index 0 w check 0, never free, no child can land on it since codes start at 1 
+        self.root = 0
+        self.codes = {}
+        self.sorted_codes = []
+        # free slots form circular doubly linked list stored in slots themselves: check = -next, base = -previous,
+        # negative check marks slot free, free_head 0 when list empty 
+        self.free_head = 0
+        for index in range(1, size):
+            self.link(index)
+
+    def link(self, index):
+        base, check, head = self.base, self.check, self.free_head
+        if not head:
+            check[index] = base[index] = -index
+            self.free_head = index
+            return
+        tail = -base[head]
+        check[tail] = -index
+        base[index] = -tail
+        check[index] = -head
+        base[head] = -index
+
+    def unlink(self, index):
+        base, check = self.base, self.check
+        next, previous = -check[index], -base[index]
+        if next == index:
+            self.free_head = 0
+            return
+        check[previous] = -next
+        base[next] = -previous
+        if self.free_head == index:
+            self.free_head = next
+
+    def grow(self, index):
+        size = len(self.check)
+        # grow only to what new base needs, doubling would leave arrays mostly free 
+        extra = index + 1 - size
+        self.base.extend(array('i', [0]) * extra)
+        self.check.extend(array('i', [0]) * extra)
+        self.word.extend(array('b', [0]) * extra)
+        self.degree.extend(array('i', [0]) * extra)
+        for new in range(size, size + extra):
+            self.link(new)
+
+    def child(self, node, character):
+        code = self.codes.get(character)
+        if code is None or not self.degree[node]:
+            return None
+        index = self.base[node] + code
+        if index < len(self.check) and self.check[index] == node:
+            return index
+        return None
+
+    def add_child(self, node, character):
+        code = self.codes.get(character)
+        if code is None:
+            code = self.codes[character] = len(self.codes) + 1
+            self.sorted_codes = sorted(self.codes.items())
+
+        if not self.degree[node]:
+            self.base[node] = self.find_base((code,))
+        else:
+            index = self.base[node] + code
+            if index < len(self.check) and self.check[index] == node:
+                return index
+            if index < len(self.check) and self.check[index] >= 0:
+                self.relocate(node, code)
+
+        index = self.base[node] + code
+        if index >= len(self.check):
+            self.grow(index)
+        self.claim(index, node)
+        self.degree[node] += 1
+        return index
+
+    def claim(self, index, parent):
+        self.unlink(index)
+        self.check[index] = parent
+        self.base[index] = 0
+        self.word[index] = 0
+        self.degree[index] = 0
+
+    def release(self, index):
+        self.word[index] = 0
+        self.degree[index] = 0
+        self.link(index)
+
+    # walk free slots, first base putting smallest code on free slot and every other code on free slot wins, 
+    # slots past end of arrays count as free, after max_trials give up and place past end 
+    def find_base(self, codes, max_trials=64):
+        check = self.check
+        size = len(check)
+        first = min(codes)
+        free = self.free_head
+        for _ in range(max_trials):
+            if not free:
+                break
+            base = free - first
+            if base >= 0 and all(base + code >= size or check[base + code] < 0 for code in codes):
+                return base
+            free = -check[free]
+            if free == self.free_head:
+                break
+        # rotate list so next search skips slots that just failed 
+        if free:
+            self.free_head = free
+        return max(size - first, 0)
+
+    # codes of node's children, stops once degree of them found 
+    def child_codes(self, node):
+        base, check, size = self.base[node], self.check, len(self.check)
+        remaining = self.degree[node]
+        codes = []
+        for _, code in self.sorted_codes:
+            if not remaining:
+                break
+            if base + code < size and check[base + code] == node:
+                codes.append(code)
+                remaining -= 1
+        return codes
+
+    # move every child of node to new base that also has room for new_code 
+    def relocate(self, node, new_code):
+        codes = self.child_codes(node)
+        old_base = self.base[node]
+        new_base = self.find_base(codes + [new_code])
+        if new_base + max(codes + [new_code]) >= len(self.check):
+            self.grow(new_base + max(codes + [new_code]))
+        self.base[node] = new_base
+
+        base, word, degree = self.base, self.word, self.degree
+        for code in codes:
+            old, new = old_base + code, new_base + code
+            grandchildren = self.child_slots(old) if degree[old] else []
+            self.claim(new, node)
+            base[new], word[new], degree[new] = base[old], word[old], degree[old]
+            # grandchildren point at moved child 
+            for grandchild in grandchildren:
+                self.check[grandchild] = new
+            self.release(old)
+
+    def child_slots(self, node):
+        return [self.base[node] + code for code in self.child_codes(node)]
+
+    def remove_child(self, node, character):
+        self.release(self.child(node, character))
+        self.degree[node] -= 1
+
+    def has_children(self, node):
+        return self.degree[node] > 0
+
+    def children(self, node):
+        if not self.degree[node]:
+            return []
+        base, check = self.base[node], self.check
+        return [(character, base + code) for character, code in self.sorted_codes 
+                if base + code < len(check) and check[base + code] == node]
+
+    def is_word(self, node):
+        return self.word[node] == 1
+
+    def set_word(self, node, is_word):
+        self.word[node] = 1 if is_word else 0
+
+TRIE_LAYOUTS = {'slots': SlotLayout, 'double_array': DoubleArrayLayout}
+
+class CompactTrie:
+    def __init__(self, words=(), layout='slots'):
+        self.layout = TRIE_LAYOUTS[layout]()
+        self.size = 0
+        for word in words:
+            self.insert(word)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, word):
+        return self.search(word)
+
+    # returns False if word already present 
+    def insert(self, word):
+        layout = self.layout
+        node = layout.root
+        for character in word:
+            node = layout.add_child(node, character)
+        if layout.is_word(node):
+            return False
+        layout.set_word(node, True)
+        self.size += 1
+        return True
+
+    def find_node(self, prefix):
+        layout = self.layout
+        node = layout.root
+        for character in prefix:
+            node = layout.child(node, character)
+            if node is None:
+                return None
+        return node
+
+    def search(self, word):
+        node = self.find_node(word)
+        return node is not None and self.layout.is_word(node)
+
+    def starts_with(self, prefix):
+        return self.find_node(prefix) is not None
+
+    # words starting w prefix in lexicographic order, iterative so deep tries don't hit recursion limit 
+    def words_with_prefix(self, prefix, limit=None):
+        layout = self.layout
+        node = self.find_node(prefix)
+        if node is None:
+            return []
+        result = []
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if layout.is_word(node):
+                result.append(word)
+                if len(result) == limit:
+                    break
+            # reversed so smallest character popped first 
+            for character, child in reversed(layout.children(node)):
+                stack.append((child, word + character))
+        return result
+
+    # unmark word, then prune nodes left w/ out children or word from bottom up 
+    def delete(self, word):
+        layout = self.layout
+        node = layout.root
+        path = []
+        for character in word:
+            path.append((node, character))
+            node = layout.child(node, character)
+            if node is None:
+                return False
+        if not layout.is_word(node):
+            return False
+        layout.set_word(node, False)
+        self.size -= 1
+
+        for parent, character in reversed(path):
+            if layout.is_word(node) or layout.has_children(node):
+                break
+            layout.remove_child(parent, character)
+            node = parent
+        return True
+
+import io
+import random
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+# memory (tracemalloc peak while building) and insert / search time of CompactTrie layouts vs 
+# existing tries, words lowercase so 26 slot tries can hold them 
+def benchmark_tries(count=50000, length=10, seed=0):
+    generator = random.Random(seed)
+    words = [''.join(generator.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(generator.randint(3, length))) 
+             for _ in range(count)]
+    queries = words[::2] + [word + 'q' for word in words[1::2]]
+
+    def build_trie1():
+        trie = Trie1()
+        for word in words:
+            trie.insert(word)
+        return trie, trie.search
+
+    def build_trie3():
+        trie = Trie3()
+        for word in words:
+            trie.insert(word)
+        # Trie3 only answers shortest stored prefix, no exact lookup to time 
+        return trie, None
+
+    def build_trie5():
+        trie = Trie5()
+        for word in words:
+            trie.insert(word)
+        return trie, trie.search
+
+    def build_list_trie():
+        trie = Trie()
+        for word in words:
+            trie.add_word(word)
+        return trie, None
+
+    def build_word_dictionary():
+        dictionary = WordDictionary()
+        with redirect_stdout(io.StringIO()):
+            for word in words:
+                dictionary.add_word(word)
+        return dictionary, dictionary.search_word
+
+    def build_compact(layout):
+        def build():
+            trie = CompactTrie(layout=layout)
+            for word in words:
+                trie.insert(word)
+            return trie, trie.search
+        return build
+
+    builders = [('Trie1', build_trie1), ('Trie3', build_trie3), ('Trie5', build_trie5), ('Trie', build_list_trie), 
+                ('WordDictionary', build_word_dictionary), ('CompactTrie slots', build_compact('slots')), 
+                ('CompactTrie double_array', build_compact('double_array'))]
+
+    results = {}
+    for name, build in builders:
+        # built twice, tracemalloc slows allocations too much to time traced build 
+        tracemalloc.start()
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        trie, search = build()
+        insert_seconds = time.perf_counter() - start
+
+        search_seconds = None
+        if search is not None:
+            start = time.perf_counter()
+            for word in queries:
+                search(word)
+            search_seconds = time.perf_counter() - start
+        results[name] = {'memory_bytes': peak, 'insert_seconds': insert_seconds, 'search_seconds': search_seconds}
+        del trie, search
+    return results
+
+'''
+radix (patricia) trie: path compressed trie, chain of single child nodes merged into one edge whose label 
+is slice of inserted string, so long strings sharing little (URLs, file paths) cost one node per branch 
+point instead of one per character, and lookups hop once per edge instead of once per character 
+
+- children keyed by first character of edge label, labels of siblings never share first character 
+- insert: follow edges while label fully matches rest of word, if word and label diverge inside label, 
+  split edge at common prefix: new middle node takes shared part, old child keeps rest of label 
+- search / replace: words only end at nodes, so word matches only if it uses up whole edges 
+- search_prefix: prefix may end inside edge label 
+- suggestions: per typed character, first k words in lexicographic order under prefix 
+
+time: insert, search, search_prefix, replace O(l) character compares but only O(edges on path) hops, 
+suggestions O(m x (m + k x l)) where m = length of search word
+space O(n) nodes where n = number of words (at most 2n - 1 nodes)
+'''
+class RadixNode:
+    __slots__ = ('label', 'children', 'is_word')
+
+    def __init__(self, label='', is_word=False):
+        self.label = label
+        self.children = {}
+        self.is_word = is_word
+
+class RadixTrie:
+    def __init__(self):
+        self.root = RadixNode()
+
+    def insert(self, word):
+        node = self.root
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                node.children[word[i]] = RadixNode(word[i:], True)
+                return
+
+            label = child.label
+            # length of common prefix of label and rest of word 
+            common = 1
+            while common < len(label) and i + common < len(word) and label[common] == word[i + common]:
+                common += 1
+
+            if common < len(label):
+                # split edge, middle node keeps shared part of label 
+                middle = RadixNode(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[word[i]] = middle
+                child = middle
+            node = child
+            i += common
+        node.is_word = True
+
+    # node reached after consuming all of string through whole edges, None if string ends inside edge or falls off 
+    def find_node(self, string):
+        node = self.root
+        i = 0
+        while i < len(string):
+            node = node.children.get(string[i])
+            if node is None or not string.startswith(node.label, i):
+                return None
+            i += len(node.label)
+        return node
+
+    def search(self, word):
+        node = self.find_node(word)
+        return node is not None and node.is_word
+
+    def search_prefix(self, prefix):
+        node = self.root
+        i = 0
+        while i < len(prefix):
+            node = node.children.get(prefix[i])
+            if node is None:
+                return False
+            # prefix may run out inside label 
+            if not prefix.startswith(node.label, i):
+                return node.label.startswith(prefix[i:])
+            i += len(node.label)
+        return True
+
+    # shortest word in trie that is prefix of word, else word itself 
+    def replace(self, word):
+        node = self.root
+        i = 0
+        while i < len(word):
+            node = node.children.get(word[i])
+            if node is None or not word.startswith(node.label, i):
+                return word
+            i += len(node.label)
+            if node.is_word:
+                return word[:i]
+        return word
+
+    # first limit words under node in lexicographic order, path = string spelled from root to node 
+    def collect(self, node, path, limit):
+        result = []
+        stack = [(node, path)]
+        while stack and len(result) < limit:
+            node, path = stack.pop()
+            if node.is_word:
+                result.append(path)
+            for first in sorted(node.children, reverse=True):
+                child = node.children[first]
+                stack.append((child, path + child.label))
+        return result
+
+    def node_count(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+    # like Trie2.search: list of at most k suggestions for every prefix of search word 
+    def suggestions(self, search_word, k=3):
+        result = []
+        node = self.root
+        # node whose edge we're on, how far into its label, path spelled up to end of that edge 
+        offset = 0
+        path = ''
+        for i, character in enumerate(search_word):
+            if offset == len(node.label):
+                node = node.children.get(character)
+                if node is None:
+                    return result + [[] for _ in range(len(search_word) - i)]
+                path += node.label
+                offset = 0
+            if node.label[offset] != character:
+                return result + [[] for _ in range(len(search_word) - i)]
+            offset += 1
+            # every word under current edge starts w typed prefix 
+            result.append(self.collect(node, path, k))
+        return result
+
+def radix_suggested_products(products, search_word, k=3):
+    trie = RadixTrie()
+    for product in products:
+        trie.insert(product)
+    return trie.suggestions(search_word, k)
+
+'''
+ranked autocomplete: suggested_products w configurable k and popularity, each node keeps its k best words 
+ranked by weight (ties lexicographic), so typing one more character is one hop + copy of k words 
+
+- entries kept as (-weight, word), smallest entry best, top of node = k smallest of node's own word and 
+  tops of its children 
+- insert of new word or reweight upward: word can only climb, along its path drop its old entry, 
+  add new one if it beats node's worst or node not full 
+- reweight downward: word may fall out and unseen word take its place, recompute tops along path bottom up 
+  from children's tops 
+- from_sorted: stream of (word, weight) sorted by word builds trie w/ out ranking per insert, nodes finished 
+  (stream moved past their prefix) get their top once from children's finished tops 
+
+time: search O(m x k) where m = length of prefix, insert O(l x k log k), downward reweight O(l x c x k) where 
+c = children per node, from_sorted O(total characters + nodes x c x k)
+space O(nodes x k)
+'''
+from heapq import nsmallest
+
+class AutocompleteNode:
+    __slots__ = ('children', 'top', 'word', 'weight')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+        self.word = None
+        self.weight = None
+
+class RankedAutocomplete:
+    def __init__(self, k=3):
+        self.k = k
+        self.root = AutocompleteNode()
+        self.weights = {}
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __contains__(self, word):
+        return word in self.weights
+
+    # root first, node of whole word last 
+    def path(self, word, create=False):
+        node = self.root
+        nodes = [node]
+        for character in word:
+            child = node.children.get(character)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[character] = AutocompleteNode()
+            node = child
+            nodes.append(node)
+        return nodes
+
+    # inserting existing word reweights it 
+    def insert(self, word, weight=0):
+        old_weight = self.weights.get(word)
+        if old_weight is not None and weight < old_weight:
+            self.reweight(word, weight)
+            return
+        nodes = self.path(word, create=True)
+        nodes[-1].word = word
+        nodes[-1].weight = weight
+        self.weights[word] = weight
+
+        entry = (-weight, word)
+        for node in nodes:
+            top = node.top
+            if old_weight is not None and (-old_weight, word) in top:
+                top.remove((-old_weight, word))
+            if len(top) < self.k or entry < top[-1]:
+                top.append(entry)
+                top.sort()
+                del top[self.k:]
+
+    def reweight(self, word, weight):
+        if word not in self.weights:
+            raise KeyError(word)
+        if weight >= self.weights[word]:
+            self.insert(word, weight)
+            return
+        nodes = self.path(word)
+        nodes[-1].weight = weight
+        self.weights[word] = weight
+        for node in reversed(nodes):
+            self.rank(node)
+
+    # top of node from its own word and its children's tops 
+    def rank(self, node):
+        candidates = [entry for child in node.children.values() for entry in child.top]
+        if node.word is not None:
+            candidates.append((-node.weight, node.word))
+        node.top = nsmallest(self.k, candidates)
+
+    # k best words for prefix 
+    def top(self, prefix):
+        node = self.root
+        for character in prefix:
+            node = node.children.get(character)
+            if node is None:
+                return []
+        return [word for _, word in node.top]
+
+    # like Trie2.search: suggestions for every typed character of prefix 
+    def search(self, prefix):
+        result = []
+        node = self.root
+        for i, character in enumerate(prefix):
+            node = node.children.get(character)
+            if node is None:
+                return result + [[] for _ in range(len(prefix) - i)]
+            result.append([word for _, word in node.top])
+        return result
+
+    @classmethod
+    def from_sorted(cls, items, k=3):
+        trie = cls(k)
+        # nodes on path of previous word, stack[d] spells previous[:d] 
+        stack = [trie.root]
+        previous = ''
+        for word, weight in items:
+            if word < previous:
+                raise ValueError("items must be sorted by word")
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            # stream moved past these prefixes, no more words under them 
+            while len(stack) > common + 1:
+                trie.rank(stack.pop())
+            node = stack[-1]
+            for character in word[common:]:
+                node.children[character] = AutocompleteNode()
+                node = node.children[character]
+                stack.append(node)
+            node.word = word
+            node.weight = weight
+            trie.weights[word] = weight
+            previous = word
+        while stack:
+            trie.rank(stack.pop())
+        return trie
+
+def ranked_suggested_products(products, search_word, weights=None, k=3):
+    weights = weights or {}
+    trie = RankedAutocomplete(k)
+    for product in products:
+        trie.insert(product, weights.get(product, 0))
+    return trie.search(search_word)